@@ -1,6 +1,8 @@
 """Configuration settings for FOIA Response Assistant."""
 
+import os
 import re
+from pathlib import Path
 from re import Pattern
 
 # Model configuration
@@ -41,6 +43,20 @@ GOVERNMENT_DOMAINS = ["@agency.gov", "@state.gov", "@federal.gov", ".gov"]
 # Classification thresholds
 CONFIDENCE_THRESHOLD = 0.7  # Below this, mark as uncertain
 
+# Rule-based pre-classification (skips the LLM call when a rule matches)
+PRE_CLASSIFY_MIN_CHARS = 20  # Shorter documents are marked uncertain
+FEEDBACK_RULE_MIN_SUPPORT = 3  # Agreeing corrections needed for a prefix rule
+FEEDBACK_RULE_MIN_AGREEMENT = 0.8  # Share of a prefix's corrections that must agree
+
+# Persistent embedding cache (keyed by provider, model, and content hash)
+EMBEDDING_CACHE_PATH = Path(
+    os.getenv(
+        "FOIA_EMBEDDING_CACHE",
+        str(Path.home() / ".foia_assistant" / "embedding_cache.db"),
+    )
+)
+EMBEDDING_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60  # Entries older than this are recomputed
+
 # Logging configuration
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_LEVEL = "INFO"
@@ -4,6 +4,7 @@ Audit Tab for FOIA Response Assistant
 Provides a document-based audit trail viewer with per-document audit history.
 """
 
+from datetime import datetime
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTextEdit, 
@@ -13,6 +14,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QColor
 
+from ...models.audit import EventType
 from ...processing.audit_manager import AuditManager
 from ...constants import BUTTON_STYLE_PRIMARY, TABLE_CHECKBOX_COLUMN_WIDTH
 from ..styles import create_title_label
@@ -164,18 +166,15 @@ class AuditTab(QWidget):
     
     def refresh(self):
         """Refresh the document table and audit display with latest entries."""
-        # Get all entries first
-        all_entries = self.audit_manager.get_entries()
-        
         # Filter entries by active request if available
         if self.request_manager:
             active_request = self.request_manager.get_active_request()
             if active_request:
-                entries = [e for e in all_entries if e.request_id == active_request.id]
+                entries = self.audit_manager.get_entries(request_id=active_request.id)
             else:
                 entries = []  # No active request, show no entries
         else:
-            entries = all_entries  # No request manager, show all entries
+            entries = self.audit_manager.get_entries()  # No request manager, show all entries
         
         # Update export button state
         count = len(entries)
@@ -221,9 +220,9 @@ class AuditTab(QWidget):
                 documents_audit_data[entry.document_filename]['entries'].append(entry)
                 
                 # Extract AI classification and human decision from entries
-                if entry.event_type == 'classify' and entry.ai_result:
+                if entry.event_type == EventType.CLASSIFY and entry.ai_result:
                     documents_audit_data[entry.document_filename]['ai_classification'] = entry.ai_result
-                elif entry.event_type == 'review' and entry.user_decision:
+                elif entry.event_type == EventType.REVIEW and entry.user_decision:
                     documents_audit_data[entry.document_filename]['human_decision'] = entry.user_decision
                 
                 # Track latest activity
@@ -280,7 +279,9 @@ class AuditTab(QWidget):
             
             # Last Activity
             if doc_data['last_activity']:
-                time_str = doc_data['last_activity'].strftime('%H:%M:%S')
+                time_str = datetime.fromtimestamp(
+                    doc_data['last_activity'] / 1_000_000_000
+                ).strftime('%H:%M:%S')
                 time_item = QTableWidgetItem(time_str)
             else:
                 time_item = QTableWidgetItem('-')
@@ -323,8 +324,8 @@ class AuditTab(QWidget):
         lines = []
         for entry in sorted_entries:
             # Format: Time | Event | Details
-            time_str = entry.timestamp.strftime('%H:%M:%S')
-            event_str = entry.event_type.upper()
+            time_str = entry.logged_at.strftime('%H:%M:%S')
+            event_str = entry.event_type.value.upper() if entry.event_type else ''
             details_str = entry.details
             
             # Add AI result and user decision if available
@@ -350,8 +351,7 @@ class AuditTab(QWidget):
             return
         
         # Get entries for this document
-        all_entries = self.audit_manager.get_entries()
-        doc_entries = [e for e in all_entries if e.document_filename == self.current_document]
+        doc_entries = self.audit_manager.get_entries(document_filter=[self.current_document])
         
         # Create data structure and call the main display method
         doc_data = {
@@ -436,29 +436,26 @@ class AuditTab(QWidget):
                 documents[doc_name] = []
             documents[doc_name].append(entry)
         
-        # Write to CSV with document grouping
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ['document', 'timestamp', 'request_id', 
-                         'event', 'details', 'ai_result', 'user_decision']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            # Write header
-            writer.writeheader()
-            
-            # Write entries grouped by document
+        def rows():
+            # Entries grouped by document, chronological within each document
             for doc_name in sorted(documents.keys()):
-                doc_entries = sorted(documents[doc_name], key=lambda e: e.timestamp)
-                
-                for entry in doc_entries:
-                    writer.writerow({
-                        'document': doc_name,
-                        'timestamp': entry.timestamp.isoformat(),
-                        'request_id': entry.request_id,
-                        'event': entry.event_type,
-                        'details': entry.details,
-                        'ai_result': entry.ai_result or '',
-                        'user_decision': entry.user_decision or ''
-                    })
+                for entry in sorted(documents[doc_name], key=lambda e: e.timestamp):
+                    yield (
+                        doc_name,
+                        entry.logged_at.isoformat(),
+                        entry.request_id,
+                        entry.event_type.value if entry.event_type else '',
+                        entry.details,
+                        entry.ai_result or '',
+                        entry.user_decision or '',
+                    )
+
+        # Write to CSV with document grouping
+        with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(['document', 'timestamp', 'request_id',
+                             'event', 'details', 'ai_result', 'user_decision'])
+            writer.writerows(rows())
     
     def refresh_request_context(self) -> None:
         """Refresh the audit display for the active request."""
@@ -833,8 +833,9 @@ class FinalizeTab(QWidget):
                     }
                 )
 
+            # Encode in one pass and write once; json.dump streams many small writes
             with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write(json.dumps(data, indent=2, ensure_ascii=False))
 
             return str(filepath)
         except Exception as e:
@@ -1,3 +1,5 @@
+import logging
+
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QKeyEvent, QShowEvent
 from PyQt6.QtWidgets import (
@@ -25,6 +27,8 @@ from src.processing.document_store import DocumentStore
 from src.processing.feedback_manager import FeedbackManager
 from src.processing.request_manager import RequestManager
 
+logger = logging.getLogger(__name__)
+
 
 class ReviewTab(QWidget):
     """Tab for reviewing document classifications."""
@@ -565,9 +569,9 @@ class ReviewTab(QWidget):
             final_state = workflow.invoke(initial_state)
             
             # Update the current document with new classification
-            self._current_document.classification = final_state["classification"]
-            self._current_document.confidence = final_state["confidence"]
-            self._current_document.justification = final_state["justification"]
+            self._current_document.classification = final_state.get("classification")
+            self._current_document.confidence = final_state.get("confidence")
+            self._current_document.justification = final_state.get("justification")
             self._current_document.exemptions = final_state.get("exemptions", [])
             
             # Clear duplicate metadata
@@ -607,6 +611,4 @@ class ReviewTab(QWidget):
             progress.close()
             
             self._show_status_message(f"Error reclassifying document: {str(e)}")
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error reclassifying document: {e}", exc_info=True)
@@ -1,6 +1,19 @@
 """LangGraph workflow components for document processing."""
 
 from .state import DocumentState
-from .workflow import get_compiled_workflow, process_document
+from .workflow import (
+    get_compiled_workflow,
+    process_document,
+    process_document_async,
+    process_documents,
+    process_documents_async,
+)
 
-__all__ = ["DocumentState", "get_compiled_workflow", "process_document"]
+__all__ = [
+    "DocumentState",
+    "get_compiled_workflow",
+    "process_document",
+    "process_document_async",
+    "process_documents",
+    "process_documents_async",
+]
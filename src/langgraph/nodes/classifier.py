@@ -1,12 +1,16 @@
 import logging
+import os
+from typing import Any
 
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
 from ...config import MODEL_CONFIG
 from ...utils.error_handling import create_error_response
+from ...utils.filenames import get_filename_prefix
 from ..state import DocumentState
 
 logger = logging.getLogger(__name__)
@@ -24,36 +28,34 @@ class ClassificationResult(BaseModel):
     )
 
 
-def classify_document(state: DocumentState) -> dict:
-    """Classify document using OpenAI."""
-    if state.get("error"):
-        return {}
+def _build_classification_request(state: DocumentState) -> tuple[Runnable, dict[str, Any]]:
+    """Build the classification chain and its inputs for a document.
 
-    # Check for API key
-    import os
+    Args:
+        state: Document state with content, request, and feedback examples
 
-    if not os.getenv("OPENAI_API_KEY"):
-        return create_error_response("OPENAI_API_KEY environment variable not set")
+    Returns:
+        Tuple of the prompt | llm | parser chain and the inputs to invoke it with
 
-    try:
-        # Initialize the model with JSON mode
-        llm = ChatOpenAI(
-            model=str(MODEL_CONFIG["classification_model"]),
-            temperature=float(MODEL_CONFIG["temperature"]),
-            model_kwargs={"response_format": {"type": "json_object"}},
-        )
+    """
+    # Initialize the model with JSON mode
+    llm = ChatOpenAI(
+        model=str(MODEL_CONFIG["classification_model"]),
+        temperature=float(MODEL_CONFIG["temperature"]),
+        model_kwargs={"response_format": {"type": "json_object"}},
+    )
 
-        # Get feedback examples if available
-        feedback_examples = state.get("feedback_examples", [])
+    # Get feedback examples if available
+    feedback_examples = state.get("feedback_examples", [])
 
-        # Log feedback summary once per batch
-        current_filename = state.get('filename', 'unknown')
-        if feedback_examples and not hasattr(classify_document, '_feedback_logged'):
-            logger.info(f"Classifier using {len(feedback_examples)} feedback examples")
-            classify_document._feedback_logged = True
+    # Log feedback summary once per batch
+    current_filename = state.get('filename', 'unknown')
+    if feedback_examples and not hasattr(classify_document, '_feedback_logged'):
+        logger.info("Classifier using %d feedback examples", len(feedback_examples))
+        classify_document._feedback_logged = True
 
-        # Build system prompt with feedback examples
-        system_prompt = """You are a FOIA (Freedom of Information Act) response analyst.
+    # Build system prompt with feedback examples
+    system_prompt = """You are a FOIA (Freedom of Information Act) response analyst.
             Your job is to classify documents based on whether they are responsive to a FOIA request.
 
             Classify documents as:
@@ -61,9 +63,9 @@ def classify_document(state: DocumentState) -> dict:
             - "non_responsive": The document is clearly unrelated to the FOIA request
             - "uncertain": You're not sure if the document is responsive (ambiguous cases)"""
 
-        # Add feedback examples if available
-        if feedback_examples:
-            system_prompt += f"""
+    # Add feedback examples if available
+    if feedback_examples:
+        system_prompt += f"""
 
 🔄 REPROCESSING CONTEXT - CRITICAL:
 You are currently REPROCESSING documents based on human feedback from your initial classification.
@@ -82,7 +84,7 @@ You are currently REPROCESSING documents based on human feedback from your initi
 These are corrections to YOUR classifications of documents in THIS EXACT BATCH:
 """
 
-            system_prompt += """
+        system_prompt += """
 🛑 PRE-CLASSIFICATION CONTENT CHECK:
 Before classifying, check if this document's CONTENT matches correction patterns:
 1. Does this document mention the SAME keywords/topics as corrected documents?
@@ -105,85 +107,85 @@ IF CONTENT MATCHES → Apply the correction pattern
 - Document type alone is NOT enough - content must match
 """
 
-            # Analyze filename patterns in feedback
-            filename_prefix_patterns = {}
-            for example in feedback_examples:
-                filename = example.get('document_filename', '')
-                if filename:
-                    # Extract prefix (e.g., 'email', 'memo', 'report')
-                    prefix = filename.split('_')[0] if '_' in filename else filename.split('.')[0]
-                    human_class = example.get('human_correction', 'unknown')
-
-                    if prefix not in filename_prefix_patterns:
-                        filename_prefix_patterns[prefix] = {}
-                    if human_class not in filename_prefix_patterns[prefix]:
-                        filename_prefix_patterns[prefix][human_class] = 0
-                    filename_prefix_patterns[prefix][human_class] += 1
-
-            # Count correction patterns
-            correction_patterns = {}
-            for example in feedback_examples:
-                pattern = f"{example.get('ai_classification', 'unknown')} → {example.get('human_correction', 'unknown')}"
-                correction_patterns[pattern] = correction_patterns.get(pattern, 0) + 1
-
-            # Show filename patterns FIRST
-            if filename_prefix_patterns:
-                system_prompt += "\n📁 FILENAME PATTERN ANALYSIS:\n"
-                for prefix, classifications in filename_prefix_patterns.items():
-                    total = sum(classifications.values())
-                    system_prompt += f"\nFilenames starting with '{prefix}_' or '{prefix}.':\n"
-                    for classification, count in classifications.items():
-                        percentage = (count / total) * 100
-                        system_prompt += f"  - {count}/{total} ({percentage:.0f}%) corrected to: {classification}\n"
-                    # Add rule if pattern is unanimous
-                    if len(classifications) == 1:
-                        only_class = list(classifications.keys())[0]
-                        system_prompt += f"  ⚠️ RULE: ALL '{prefix}' files were corrected to {only_class}\n"
-
-            # Show patterns after filename analysis
-            if correction_patterns:
-                system_prompt += "\n📊 CORRECTION PATTERNS (what you got wrong):\n"
-                for pattern, count in sorted(correction_patterns.items(), key=lambda x: x[1], reverse=True):
-                    system_prompt += f"- {count}x times: You classified as '{pattern.split(' → ')[0]}' but human corrected to '{pattern.split(' → ')[1]}'\n"
-
-            system_prompt += "\n📝 CORRECTIONS FROM THIS BATCH:\n"
-            for i, example in enumerate(feedback_examples, 1):
-                ai_class = example.get('ai_classification', 'N/A')
-                human_class = example.get('human_correction', 'N/A')
-                snippet = example.get('document_snippet', 'N/A')
-                confidence = example.get('confidence', 0)
-                doc_filename = example.get('document_filename', 'N/A')
-                correction_reason = example.get('correction_reason', '')
-
-                # Analyze document type from filename
-                doc_type = "document"
-                if doc_filename.startswith("email"):
-                    doc_type = "EMAIL"
-                elif doc_filename.startswith("memo"):
-                    doc_type = "MEMO"
-                elif doc_filename.startswith("report"):
-                    doc_type = "REPORT"
-                elif doc_filename.startswith("meeting"):
-                    doc_type = "MEETING DOCUMENT"
-
-                # Extract key content patterns from snippet
-                import re
-                key_terms = []
-                # Look for capitalized phrases (likely project names, departments)
-                caps_pattern = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', snippet)
-                key_terms.extend(caps_pattern)
-                # Look for quoted terms
-                quoted_pattern = re.findall(r'"([^"]+)"', snippet)
-                key_terms.extend(quoted_pattern)
-                # Look for specific known patterns
-                if "Blue Sky" in snippet or "blue sky" in snippet.lower():
-                    key_terms.append("Blue Sky")
-                if "atmospheric" in snippet.lower():
-                    key_terms.append("atmospheric")
-
-                unique_terms = list(set(key_terms))[:5]  # Limit to 5 key terms
-
-                system_prompt += f"""
+        # Analyze filename patterns in feedback
+        filename_prefix_patterns = {}
+        for example in feedback_examples:
+            filename = example.get('document_filename', '')
+            if filename:
+                # Extract prefix (e.g., 'email', 'memo', 'report')
+                prefix = get_filename_prefix(filename)
+                human_class = example.get('human_correction', 'unknown')
+
+                if prefix not in filename_prefix_patterns:
+                    filename_prefix_patterns[prefix] = {}
+                if human_class not in filename_prefix_patterns[prefix]:
+                    filename_prefix_patterns[prefix][human_class] = 0
+                filename_prefix_patterns[prefix][human_class] += 1
+
+        # Count correction patterns
+        correction_patterns = {}
+        for example in feedback_examples:
+            pattern = f"{example.get('ai_classification', 'unknown')} → {example.get('human_correction', 'unknown')}"
+            correction_patterns[pattern] = correction_patterns.get(pattern, 0) + 1
+
+        # Show filename patterns FIRST
+        if filename_prefix_patterns:
+            system_prompt += "\n📁 FILENAME PATTERN ANALYSIS:\n"
+            for prefix, classifications in filename_prefix_patterns.items():
+                total = sum(classifications.values())
+                system_prompt += f"\nFilenames starting with '{prefix}_' or '{prefix}.':\n"
+                for classification, count in classifications.items():
+                    percentage = (count / total) * 100
+                    system_prompt += f"  - {count}/{total} ({percentage:.0f}%) corrected to: {classification}\n"
+                # Add rule if pattern is unanimous
+                if len(classifications) == 1:
+                    only_class = list(classifications.keys())[0]
+                    system_prompt += f"  ⚠️ RULE: ALL '{prefix}' files were corrected to {only_class}\n"
+
+        # Show patterns after filename analysis
+        if correction_patterns:
+            system_prompt += "\n📊 CORRECTION PATTERNS (what you got wrong):\n"
+            for pattern, count in sorted(correction_patterns.items(), key=lambda x: x[1], reverse=True):
+                system_prompt += f"- {count}x times: You classified as '{pattern.split(' → ')[0]}' but human corrected to '{pattern.split(' → ')[1]}'\n"
+
+        system_prompt += "\n📝 CORRECTIONS FROM THIS BATCH:\n"
+        for i, example in enumerate(feedback_examples, 1):
+            ai_class = example.get('ai_classification', 'N/A')
+            human_class = example.get('human_correction', 'N/A')
+            snippet = example.get('document_snippet', 'N/A')
+            confidence = example.get('confidence', 0)
+            doc_filename = example.get('document_filename', 'N/A')
+            correction_reason = example.get('correction_reason', '')
+
+            # Analyze document type from filename
+            doc_type = "document"
+            if doc_filename.startswith("email"):
+                doc_type = "EMAIL"
+            elif doc_filename.startswith("memo"):
+                doc_type = "MEMO"
+            elif doc_filename.startswith("report"):
+                doc_type = "REPORT"
+            elif doc_filename.startswith("meeting"):
+                doc_type = "MEETING DOCUMENT"
+
+            # Extract key content patterns from snippet
+            import re
+            key_terms = []
+            # Look for capitalized phrases (likely project names, departments)
+            caps_pattern = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', snippet)
+            key_terms.extend(caps_pattern)
+            # Look for quoted terms
+            quoted_pattern = re.findall(r'"([^"]+)"', snippet)
+            key_terms.extend(quoted_pattern)
+            # Look for specific known patterns
+            if "Blue Sky" in snippet or "blue sky" in snippet.lower():
+                key_terms.append("Blue Sky")
+            if "atmospheric" in snippet.lower():
+                key_terms.append("atmospheric")
+
+            unique_terms = list(set(key_terms))[:5]  # Limit to 5 key terms
+
+            system_prompt += f"""
 Correction {i}: ❌ YOUR MISTAKE FROM THIS BATCH
 - Document: "{doc_filename}" (TYPE: {doc_type})
 - Key content patterns: {', '.join(unique_terms) if unique_terms else 'N/A'}
@@ -191,10 +193,10 @@ Correction {i}: ❌ YOUR MISTAKE FROM THIS BATCH
 - YOU classified as: {ai_class} (confidence: {confidence:.1%})
 - HUMAN corrected to: {human_class}"""
 
-                if correction_reason:
-                    system_prompt += f"\n- 🔍 REASON: {correction_reason}"
+            if correction_reason:
+                system_prompt += f"\n- 🔍 REASON: {correction_reason}"
 
-                system_prompt += f"""
+            system_prompt += f"""
 
 🚨 CONTENT PATTERN APPLICATION:
 - Documents mentioning: {', '.join(unique_terms) if unique_terms else 'these topics'} → should be "{human_class}"
@@ -202,19 +204,19 @@ Correction {i}: ❌ YOUR MISTAKE FROM THIS BATCH
 - Apply when: Current document discusses the SAME topics/projects as the correction
 """
 
-            # Add stronger guidance based on patterns
-            most_common_mistake = max(correction_patterns.items(), key=lambda x: x[1]) if correction_patterns else None
-            if most_common_mistake:
-                mistake_pattern, count = most_common_mistake
-                from_class, to_class = mistake_pattern.split(' → ')
-                system_prompt += f"""
+        # Add stronger guidance based on patterns
+        most_common_mistake = max(correction_patterns.items(), key=lambda x: x[1]) if correction_patterns else None
+        if most_common_mistake:
+            mistake_pattern, count = most_common_mistake
+            from_class, to_class = mistake_pattern.split(' → ')
+            system_prompt += f"""
 🚨 PATTERN INSIGHT: You incorrectly classified as "{from_class}" when it should be "{to_class}" {count} times.
 - Look for CONTENT patterns in these corrections
 - When you see SIMILAR CONTENT, apply "{to_class}"
 - Focus on WHY these documents were corrected (content, not just type)
 """
 
-            system_prompt += """
+        system_prompt += """
 
 🎯 FILENAME-AWARE CLASSIFICATION RULES:
 1. ALWAYS check filename prefix patterns FIRST
@@ -238,7 +240,7 @@ Correction {i}: ❌ YOUR MISTAKE FROM THIS BATCH
 Remember: The human already reviewed documents JUST LIKE THIS ONE and corrected your mistakes. Don't make the same mistake again!"""
 
 
-        system_prompt += """
+    system_prompt += """
 
             You must respond with valid JSON containing these exact fields:
             {{
@@ -247,13 +249,13 @@ Remember: The human already reviewed documents JUST LIKE THIS ONE and corrected
                 "justification": "your explanation here"
             }}"""
 
-        # Create the classification prompt
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", system_prompt),
-                (
-                    "user",
-                    """FOIA Request: {foia_request}
+    # Create the classification prompt
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            ("system", system_prompt),
+            (
+                "user",
+                """FOIA Request: {foia_request}
 
             🔍 CURRENT DOCUMENT FILENAME: {filename}
             
@@ -266,67 +268,120 @@ Remember: The human already reviewed documents JUST LIKE THIS ONE and corrected
             {content}
 
             Classify this document and explain your reasoning. Remember to check filename patterns FIRST.""",
-                ),
-            ]
+            ),
+        ]
+    )
+
+    # Create the chain with JSON output parser
+    parser = JsonOutputParser(pydantic_object=ClassificationResult)
+    chain = prompt | llm | parser
+
+    # Filename prefix for the prompt (precomputed by load_document)
+    current_filename = state.get("filename", "")
+    filename_prefix = state.get("filename_prefix") or get_filename_prefix(
+        current_filename
+    )
+
+    return chain, {
+        "foia_request": state["foia_request"],
+        "filename": state["filename"],
+        "filename_prefix": filename_prefix,
+        "content": state["content"],
+    }
+
+
+def _handle_classification_result(state: DocumentState, result: dict[str, Any]) -> dict:
+    """Log a classification result and convert it to a state update."""
+    current_filename = state.get("filename", "")
+
+    # Log the AI's response to see if it's considering feedback (only for key documents)
+    if current_filename.endswith('_001.txt') or 'email_blue_sky' in current_filename:
+        logger.debug(
+            "AI response for %s: classification=%s, confidence=%.1f%%",
+            current_filename,
+            result["classification"],
+            result["confidence"] * 100,
+        )
+
+    # Log to audit trail if audit_manager is available
+    audit_manager = state.get("audit_manager")
+    filename = state.get("filename", "unknown")
+    request_id = state.get("request_id", "unknown")
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Classified %s as %s (%.2f); audit_manager=%s, request_id=%s",
+            filename,
+            result["classification"],
+            result["confidence"],
+            type(audit_manager).__name__,
+            request_id,
         )
 
-        # Create the chain with JSON output parser
-        parser = JsonOutputParser(pydantic_object=ClassificationResult)
-        chain = prompt | llm | parser
+    if audit_manager:
+        audit_manager.log_classification(
+            filename=filename,
+            result=result["classification"],
+            confidence=result["confidence"],
+            request_id=request_id
+        )
+    else:
+        logger.warning("No audit_manager in state for %s", filename)
+
+    # Result is already parsed by JsonOutputParser (returns dict)
+    return {
+        "classification": result["classification"],
+        "confidence": result["confidence"],
+        "justification": result["justification"],
+    }
+
+
+def _handle_classification_error(state: DocumentState, e: Exception) -> dict:
+    """Log a classification failure and convert it to an error state update."""
+    # Log error to audit trail if audit_manager is available
+    audit_manager = state.get("audit_manager")
+    if audit_manager:
+        audit_manager.log_error(
+            filename=state.get("filename"),
+            error_message=str(e),
+            request_id=state.get("request_id", "unknown")
+        )
+    return create_error_response(e)
 
-        # Extract filename prefix for the prompt
-        current_filename = state.get("filename", "")
-        filename_prefix = current_filename.split('_')[0] if '_' in current_filename else current_filename.split('.')[0]
+
+def classify_document(state: DocumentState) -> dict:
+    """Classify document using OpenAI."""
+    if state.get("error"):
+        return {}
+
+    # Check for API key
+    if not os.getenv("OPENAI_API_KEY"):
+        return create_error_response("OPENAI_API_KEY environment variable not set")
+
+    try:
+        chain, inputs = _build_classification_request(state)
 
         # Get the classification
-        result = chain.invoke({
-            "foia_request": state["foia_request"],
-            "filename": state["filename"],
-            "filename_prefix": filename_prefix,
-            "content": state["content"]
-        })
-
-        # Log the AI's response to see if it's considering feedback (only for key documents)
-        if current_filename.endswith('_001.txt') or 'email_blue_sky' in current_filename:
-            logger.debug(f"AI response for {current_filename}: "
-                        f"classification={result['classification']}, "
-                        f"confidence={result['confidence']:.1%}")
-
-        # Log to audit trail if audit_manager is available
-        audit_manager = state.get("audit_manager")
-        filename = state.get("filename", "unknown")
-        request_id = state.get("request_id", "unknown")
-        
-        logger.info(f"🔍 CLASSIFIER: About to log classification for {filename}")
-        logger.info(f"🔍 CLASSIFIER: audit_manager type: {type(audit_manager)}")
-        logger.info(f"🔍 CLASSIFIER: request_id: {request_id}")
-        
-        if audit_manager:
-            logger.info(f"🔍 CLASSIFIER: Calling log_classification for {filename}: {result['classification']} ({result['confidence']:.2f})")
-            audit_manager.log_classification(
-                filename=filename,
-                result=result["classification"],
-                confidence=result["confidence"],
-                request_id=request_id
-            )
-            logger.info(f"🔍 CLASSIFIER: log_classification call completed")
-        else:
-            logger.warning(f"🔍 CLASSIFIER: No audit_manager in state!")
-
-        # Result is already parsed by JsonOutputParser (returns dict)
-        return {
-            "classification": result["classification"],
-            "confidence": result["confidence"],
-            "justification": result["justification"],
-        }
+        result = chain.invoke(inputs)
+        return _handle_classification_result(state, result)
+    except Exception as e:
+        return _handle_classification_error(state, e)
+
+
+async def aclassify_document(state: DocumentState) -> dict:
+    """Classify document using OpenAI without blocking the event loop."""
+    if state.get("error"):
+        return {}
+
+    # Check for API key
+    if not os.getenv("OPENAI_API_KEY"):
+        return create_error_response("OPENAI_API_KEY environment variable not set")
 
+    try:
+        chain, inputs = _build_classification_request(state)
+
+        # Get the classification
+        result = await chain.ainvoke(inputs)
+        return _handle_classification_result(state, result)
     except Exception as e:
-        # Log error to audit trail if audit_manager is available
-        audit_manager = state.get("audit_manager")
-        if audit_manager:
-            audit_manager.log_error(
-                filename=state.get("filename"),
-                error_message=str(e),
-                request_id=state.get("request_id", "unknown")
-            )
-        return create_error_response(e)
+        return _handle_classification_error(state, e)
@@ -1,10 +1,58 @@
+import asyncio
+import hashlib
 from pathlib import Path
 
 from ...exceptions import DocumentLoadError
 from ...utils.error_handling import create_error_response
+from ...utils.filenames import get_filename_prefix
 from ..state import DocumentState
 
 
+def read_text(filepath: Path) -> str:
+    """Read a UTF-8 text file with one whole-file read and decode.
+
+    Newlines are normalized as in text mode, without the text I/O layer.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        The file content
+
+    Raises:
+        UnicodeDecodeError: If the file is not valid UTF-8
+
+    """
+    content = filepath.read_bytes().decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def read_text_with_hash(filepath: Path) -> tuple[str, str]:
+    """Read a UTF-8 text file and hash its content in the same pass.
+
+    Newlines are normalized as in text mode, and the hash is the SHA-256 of
+    the returned content so it matches EmbeddingService.generate_content_hash.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        Tuple of (content, content hash)
+
+    Raises:
+        UnicodeDecodeError: If the file is not valid UTF-8
+
+    """
+    raw = filepath.read_bytes()
+    content = raw.decode("utf-8")
+    if b"\r" in raw:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content, hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return content, hashlib.sha256(raw).hexdigest()
+
+
 def load_document(state: DocumentState) -> dict:
     """Load document content from file.
 
@@ -12,15 +60,16 @@ def load_document(state: DocumentState) -> dict:
         state: Document state containing filename
 
     Returns:
-        Dict with content or error
+        Dict with content, content hash, and filename prefix, or error
 
     """
-    # If content is already provided, just return empty dict (no update needed)
+    filename = state.get("filename")
+
+    # If content is already provided, only the filename prefix needs computing
     if state.get("content"):
-        return {}
+        return {"filename_prefix": get_filename_prefix(filename)} if filename else {}
 
     try:
-        filename = state.get("filename")
         if not filename:
             raise DocumentLoadError("No filename provided")
 
@@ -35,13 +84,16 @@ def load_document(state: DocumentState) -> dict:
         if filepath.stat().st_size == 0:
             raise DocumentLoadError(f"Empty file: {filepath}")
 
-        with open(filepath, encoding="utf-8") as f:
-            content = f.read()
+        content, content_hash = read_text_with_hash(filepath)
 
         if not content.strip():
             raise DocumentLoadError(f"File contains only whitespace: {filepath}")
 
-        return {"content": content}
+        return {
+            "content": content,
+            "content_hash": content_hash,
+            "filename_prefix": get_filename_prefix(filename),
+        }
 
     except DocumentLoadError as e:
         return create_error_response(e, classification=None)
@@ -53,3 +105,21 @@ def load_document(state: DocumentState) -> dict:
         return create_error_response(
             f"Unexpected error loading document: {e!s}", classification=None
         )
+
+
+async def aload_document(state: DocumentState) -> dict:
+    """Load document content without blocking the event loop.
+
+    Runs :func:`load_document` in a worker thread so file reads overlap with
+    other documents' LLM calls under ``ainvoke``.
+
+    Args:
+        state: Document state containing filename
+
+    Returns:
+        Dict with content, content hash, and filename prefix, or error
+
+    """
+    if state.get("content"):
+        return load_document(state)
+    return await asyncio.to_thread(load_document, state)
@@ -2,6 +2,7 @@
 
 import logging
 
+from ...models.classification import Classification
 from ..state import DocumentState
 
 logger = logging.getLogger(__name__)
@@ -50,7 +51,7 @@ def check_duplicate(state: DocumentState) -> dict:
             duplicate_type = f"near duplicate ({similarity_score:.0%} similar)"
         
         return {
-            "classification": "duplicate",
+            "classification": Classification.DUPLICATE.value,
             "confidence": 1.0,  # We're certain it's a duplicate based on embeddings
             "justification": f"This document is a {duplicate_type} of '{duplicate_of}'. "
                            f"Skipping AI classification to save API calls.",
@@ -0,0 +1,111 @@
+"""Node for rule-based classification of trivially decidable documents."""
+
+import logging
+
+from ...config import (
+    FEEDBACK_RULE_MIN_AGREEMENT,
+    FEEDBACK_RULE_MIN_SUPPORT,
+    PRE_CLASSIFY_MIN_CHARS,
+)
+from ...utils.filenames import get_filename_prefix
+from ..state import DocumentState
+
+logger = logging.getLogger(__name__)
+
+
+def compile_feedback_rules(
+    feedback_examples: list[dict] | None,
+) -> dict[str, tuple[str, int, int]]:
+    """Build filename prefix rules from consistent human corrections.
+
+    Args:
+        feedback_examples: Feedback examples formatted for prompts
+
+    Returns:
+        Mapping of filename prefix to (classification, supporting
+        corrections, corrections for the prefix)
+
+    """
+    if not feedback_examples:
+        return {}
+
+    prefix_patterns: dict[str, dict[str, int]] = {}
+    for example in feedback_examples:
+        filename = example.get("document_filename", "")
+        human_class = example.get("human_correction")
+        if not filename or not human_class:
+            continue
+        counts = prefix_patterns.setdefault(get_filename_prefix(filename), {})
+        counts[human_class] = counts.get(human_class, 0) + 1
+
+    rules = {}
+    for prefix, classifications in prefix_patterns.items():
+        classification, count = max(classifications.items(), key=lambda item: item[1])
+        total = sum(classifications.values())
+        if count >= FEEDBACK_RULE_MIN_SUPPORT and count / total >= FEEDBACK_RULE_MIN_AGREEMENT:
+            rules[prefix] = (classification, count, total)
+
+    return rules
+
+
+def pre_classify(state: DocumentState) -> dict:
+    """Classify documents that do not need the LLM.
+
+    Covers documents too short to judge and filename prefixes where
+    human corrections consistently agreed.
+
+    Args:
+        state: The document state
+
+    Returns:
+        Classification fields when a rule matches, otherwise an empty dict
+
+    """
+    if state.get("error"):
+        return {}
+
+    filename = state.get("filename", "")
+    content = (state.get("content") or "").strip()
+
+    if len(content) < PRE_CLASSIFY_MIN_CHARS:
+        rule = f"document has only {len(content)} characters of text"
+        result = {
+            "classification": "uncertain",
+            "confidence": 0.0,
+            "justification": (
+                f"Document has only {len(content)} characters of text; "
+                "too short to classify automatically."
+            ),
+        }
+    else:
+        # Rules are normally compiled once per feedback version by FeedbackManager
+        rules = state.get("feedback_rules")
+        if rules is None:
+            rules = compile_feedback_rules(state.get("feedback_examples"))
+        prefix = state.get("filename_prefix") or get_filename_prefix(filename)
+        if prefix not in rules:
+            return {}
+        classification, count, total = rules[prefix]
+        rule = f"'{prefix}' filename rule, {count} of {total} corrections agreed"
+        result = {
+            "classification": classification,
+            # The share of corrections that agreed, not certainty
+            "confidence": count / total,
+            "justification": (
+                f"{count} of {total} reviewed '{prefix}' files were corrected to "
+                f"{classification}; applied that rule without AI classification."
+            ),
+        }
+
+    logger.debug("Pre-classified %s as %s", filename, result["classification"])
+
+    audit_manager = state.get("audit_manager")
+    if audit_manager:
+        audit_manager.log_rule_classification(
+            filename=filename,
+            result=result["classification"],
+            rule=rule,
+            request_id=state.get("request_id", "unknown"),
+        )
+
+    return result
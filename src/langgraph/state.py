@@ -1,14 +1,24 @@
 from typing import TypedDict
 
 
-class DocumentState(TypedDict):
-    """State that flows through the LangGraph workflow."""
+class _DocumentInput(TypedDict):
+    """Fields every document state starts with."""
 
-    # Input fields
     filename: str
     content: str
     foia_request: str
 
+
+class DocumentState(_DocumentInput, total=False):
+    """State that flows through the LangGraph workflow.
+
+    Fields other than the inputs are optional; nodes read them with ``.get``
+    and only the keys a node returns are written back.
+    """
+
+    # Input fields
+    filename_prefix: str | None  # Set by load_document, e.g. "email" for email_x.txt
+
     # Duplicate detection fields
     is_duplicate: bool | None
     duplicate_of: str | None
@@ -31,6 +41,7 @@ class DocumentState(TypedDict):
     # Learning
     patterns_learned: list[str] | None
     feedback_examples: list[dict] | None  # List of previous corrections for few-shot learning
+    feedback_rules: dict[str, tuple[str, int, int]] | None  # Prefix rules compiled from them
 
     # Workflow control
     error: str | None
@@ -1,57 +1,104 @@
+import asyncio
+import hashlib
+import logging
+import os
+from contextlib import closing
+from pathlib import Path
 from typing import Any, cast
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
-from .nodes.classifier import classify_document
-from .nodes.document_loader import load_document
+from ..models.classification import Classification
+from ..services.embedding_cache import CachedEmbeddingClient
+from ..services.embedding_service import EmbeddingService
+from ..services.embedding_store import EmbeddingStore
+from ..services.minhash import NearDuplicateIndex
+from .nodes.classifier import aclassify_document, classify_document
+from .nodes.document_loader import aload_document, load_document, read_text_with_hash
 from .nodes.duplicate_checker import check_duplicate
 from .nodes.exemption_detector import detect_exemptions
+from .nodes.pre_classifier import pre_classify
 from .state import DocumentState
 
+logger = logging.getLogger(__name__)
 
-def get_compiled_workflow() -> CompiledStateGraph[DocumentState, Any]:
-    """Get or create the compiled workflow.
+# Compiled once and shared; compiled graphs are stateless between invocations
+_APP: CompiledStateGraph[DocumentState, Any] | None = None
+
+
+def route_after_duplicate_check(state: DocumentState) -> str:
+    """Route based on whether document is a duplicate."""
+    logger.debug(
+        "Routing decision for %s: classification=%s",
+        state.get("filename"),
+        state.get("classification"),
+    )
+
+    # If document was classified as duplicate, skip to end
+    if state.get("classification") == Classification.DUPLICATE:
+        logger.info("Skipping classification for duplicate: %s", state.get("filename"))
+        return "end"
+    # Otherwise continue to classification
+    return "classify"
+
+
+def route_after_pre_classify(state: DocumentState) -> str:
+    """Skip the LLM classifier when a rule already classified the document."""
+    if state.get("classification") is None:
+        return "classify"
+    return "detect_exemptions"
+
+
+def _build_workflow() -> StateGraph:
+    """Build the document processing graph.
 
     Returns:
-        Compiled LangGraph workflow
+        Uncompiled LangGraph workflow
 
     """
     # Create a new graph
     workflow = StateGraph(DocumentState)
 
     # Add nodes
-    workflow.add_node("load_document", load_document)
+    # Loader has an async variant so file reads run off the event loop
+    workflow.add_node(
+        "load_document",
+        RunnableLambda(load_document, afunc=aload_document, name="load_document"),
+    )
     workflow.add_node("check_duplicate", check_duplicate)
-    workflow.add_node("classify", classify_document)
+    workflow.add_node("pre_classify", pre_classify)
+
+    # Classifier has an async variant so ainvoke can overlap LLM calls
+    workflow.add_node(
+        "classify",
+        RunnableLambda(classify_document, afunc=aclassify_document, name="classify"),
+    )
     workflow.add_node("detect_exemptions", detect_exemptions)
 
     # Define the flow with conditional routing
     workflow.add_edge("load_document", "check_duplicate")
     
     # Conditional edge from duplicate checker
-    def route_after_duplicate_check(state: DocumentState) -> str:
-        """Route based on whether document is a duplicate."""
-        # Add debug logging
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.debug(f"Routing decision for {state.get('filename')}: classification={state.get('classification')}")
-        
-        # If document was classified as duplicate, skip to end
-        if state.get("classification") == "duplicate":
-            logger.info(f"Skipping classification for duplicate: {state.get('filename')}")
-            return "end"
-        # Otherwise continue to classification
-        return "classify"
-    
     workflow.add_conditional_edges(
         "check_duplicate",
         route_after_duplicate_check,
         {
-            "classify": "classify",
+            "classify": "pre_classify",
             "end": "__end__"
         }
     )
+
+    # Conditional edge from rule-based pre-classifier
+    workflow.add_conditional_edges(
+        "pre_classify",
+        route_after_pre_classify,
+        {
+            "classify": "classify",
+            "detect_exemptions": "detect_exemptions",
+        }
+    )
     
     # Normal flow for non-duplicates
     workflow.add_edge("classify", "detect_exemptions")
@@ -62,8 +109,20 @@ def get_compiled_workflow() -> CompiledStateGraph[DocumentState, Any]:
     # Set the finish point (for non-duplicates)
     workflow.set_finish_point("detect_exemptions")
 
-    # Compile and cache the workflow
-    return workflow.compile()
+    return workflow
+
+
+def get_compiled_workflow() -> CompiledStateGraph[DocumentState, Any]:
+    """Get or create the compiled workflow.
+
+    Returns:
+        Compiled LangGraph workflow
+
+    """
+    global _APP
+    if _APP is None:
+        _APP = _build_workflow().compile()
+    return _APP
 
 
 def create_initial_state(filename: str, foia_request: str) -> DocumentState:
@@ -77,30 +136,8 @@ def create_initial_state(filename: str, foia_request: str) -> DocumentState:
         Initial document state
 
     """
-    return {
-        "filename": filename,
-        "foia_request": foia_request,
-        "content": "",
-        # Duplicate detection fields
-        "is_duplicate": None,
-        "duplicate_of": None,
-        "similarity_score": None,
-        "content_hash": None,
-        "embedding_generated": None,
-        # Classification fields
-        "classification": None,
-        "confidence": None,
-        "justification": None,
-        "exemptions": None,
-        "human_decision": None,
-        "human_feedback": None,
-        "patterns_learned": None,
-        "feedback_examples": None,
-        "error": None,
-        # Audit logging fields
-        "audit_manager": None,
-        "request_id": None,
-    }
+    # Only the inputs are set; nodes read every other field with .get
+    return {"filename": filename, "foia_request": foia_request, "content": ""}
 
 
 def process_document(filename: str, foia_request: str) -> DocumentState:
@@ -125,3 +162,163 @@ def process_document(filename: str, foia_request: str) -> DocumentState:
 
     # Cast result to DocumentState type
     return cast(DocumentState, result)
+
+
+def _mark_duplicates(states: list[DocumentState]) -> None:
+    """Detect exact and near duplicates across a batch of loaded states.
+
+    Exact duplicates are found by content hash and near duplicates (small
+    edits or reformatting) by MinHash signature; neither is embedded or needs
+    the API. The remaining documents are embedded through the persistent
+    cache, with misses sent in batched calls, before similarity comparison;
+    that step is skipped when no embedding service is available.
+
+    Args:
+        states: Initial states with content already populated
+
+    """
+    near_duplicate_index = NearDuplicateIndex()
+    originals: dict[str, str] = {}
+    to_embed: list[DocumentState] = []
+
+    for state in states:
+        content = state["content"]
+        if not content:
+            continue
+        content_hash = state.get("content_hash")
+        if not content_hash:
+            # Same digest as EmbeddingService.generate_content_hash
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            state["content_hash"] = content_hash
+        name = Path(state["filename"]).name
+
+        if content_hash in originals:
+            state["is_duplicate"] = True
+            state["duplicate_of"] = originals[content_hash]
+            state["similarity_score"] = 1.0
+            continue
+
+        originals[content_hash] = name
+        near_duplicate = near_duplicate_index.find_or_insert(name, content)
+        if near_duplicate:
+            state["is_duplicate"] = True
+            state["duplicate_of"], state["similarity_score"] = near_duplicate
+        else:
+            to_embed.append(state)
+
+    if not to_embed:
+        return
+    try:
+        embedding_service = EmbeddingService()
+    except ValueError as e:
+        logger.warning("Skipping embedding-based duplicate detection: %s", e)
+        return
+
+    embedding_store = EmbeddingStore()
+    with closing(CachedEmbeddingClient(embedding_service)) as embedding_client:
+        embeddings = embedding_client.get_or_compute(
+            [state["content"] for state in to_embed],
+            [state["content_hash"] for state in to_embed],
+        )
+
+    for state, embedding in zip(to_embed, embeddings, strict=True):
+        state["is_duplicate"] = False
+        state["embedding_generated"] = embedding is not None
+        if embedding is None:
+            continue
+
+        name = Path(state["filename"]).name
+        similar_docs = embedding_store.find_similar("batch", embedding)
+        if similar_docs:
+            state["is_duplicate"] = True
+            state["duplicate_of"] = similar_docs[0][0]
+            state["similarity_score"] = similar_docs[0][1]
+        embedding_store.add_embedding("batch", name, embedding, state["content_hash"])
+
+
+def _prepare_states(filenames: list[str], foia_request: str) -> list[DocumentState]:
+    """Load documents and mark duplicates before running the graph.
+
+    Args:
+        filenames: Paths to documents to process
+        foia_request: FOIA request to check against
+
+    Returns:
+        Initial states with content and duplicate metadata populated
+
+    """
+    states = []
+    for filename in filenames:
+        state = create_initial_state(filename, foia_request)
+        try:
+            # load_document skips the read when content is already present
+            state["content"], state["content_hash"] = read_text_with_hash(Path(filename))
+        except (OSError, UnicodeDecodeError):
+            # Leave content empty so load_document reports the error
+            pass
+        states.append(state)
+
+    _mark_duplicates(states)
+    return states
+
+
+def process_documents(filenames: list[str], foia_request: str) -> list[DocumentState]:
+    """Process a batch of documents with batched embedding and duplicate detection.
+
+    Args:
+        filenames: Paths to documents to process
+        foia_request: FOIA request to check against
+
+    Returns:
+        Document states after processing, in the order of ``filenames``
+
+    """
+    app = get_compiled_workflow()
+    states = _prepare_states(filenames, foia_request)
+    return [cast(DocumentState, app.invoke(state)) for state in states]
+
+
+async def process_document_async(filename: str, foia_request: str) -> DocumentState:
+    """Process a single document through the workflow asynchronously.
+
+    Args:
+        filename: Path to document to process
+        foia_request: FOIA request to check against
+
+    Returns:
+        Document state after processing
+
+    """
+    app = get_compiled_workflow()
+    result = await app.ainvoke(create_initial_state(filename, foia_request))
+    return cast(DocumentState, result)
+
+
+async def process_documents_async(
+    filenames: list[str], foia_request: str, concurrency: int = 8
+) -> list[DocumentState]:
+    """Process a batch of documents with concurrent LLM calls.
+
+    Args:
+        filenames: Paths to documents to process
+        foia_request: FOIA request to check against
+        concurrency: Maximum number of documents in flight at once
+
+    Returns:
+        Document states after processing, in the order of ``filenames``
+
+    """
+    app = get_compiled_workflow()
+    states = await asyncio.to_thread(_prepare_states, filenames, foia_request)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(state: DocumentState) -> DocumentState:
+        async with semaphore:
+            return cast(DocumentState, await app.ainvoke(state))
+
+    return list(await asyncio.gather(*(bounded(state) for state in states)))
+
+
+# Compile at import so the first document does not pay for graph construction
+if not os.environ.get("FOIA_LAZY_WORKFLOW"):
+    get_compiled_workflow()
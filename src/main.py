@@ -7,6 +7,7 @@ from PyQt6.QtWidgets import QApplication
 
 from .constants import APP_STYLE
 from .gui.main_window import MainWindow
+from .processing.worker import shutdown_workers
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +30,7 @@ def main() -> None:
     load_dotenv(env_path)
 
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(shutdown_workers)
 
     # Set application style
     app.setStyle(APP_STYLE)
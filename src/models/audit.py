@@ -1,22 +1,46 @@
 """Audit trail data models for FOIA document processing.
 """
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
+from enum import Enum
 from typing import Any
 
 
-@dataclass
+# Column order used by to_row and CSV exports
+AUDIT_CSV_FIELDS = ['timestamp', 'request_id', 'document',
+                    'event', 'details', 'ai_result', 'user_decision']
+
+
+class EventType(str, Enum):
+    """Audit event types."""
+
+    CLASSIFY = "classify"
+    REVIEW = "review"
+    VIEW = "view"
+    EXPORT = "export"
+    ERROR = "error"
+    EMBEDDING = "embedding"
+    DUPLICATE = "duplicate"
+
+
+@dataclass(slots=True)
 class AuditEntry:
     """Represents a single audit log entry."""
 
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: int = field(default_factory=time.time_ns)  # Nanoseconds since the epoch
     request_id: str = ""
     document_filename: str | None = None
-    event_type: str = ""  # "classify", "review", "view", "export", "error"
+    event_type: EventType | None = None
     details: str = ""
     ai_result: str | None = None
     user_decision: str | None = None
 
+    @property
+    def logged_at(self) -> datetime:
+        """Local time the entry was logged."""
+        return datetime.fromtimestamp(self.timestamp / 1_000_000_000)
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for CSV export.
         
@@ -25,11 +49,28 @@ class AuditEntry:
 
         """
         return {
-            'timestamp': self.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': self.logged_at.strftime('%Y-%m-%d %H:%M:%S'),
             'request_id': self.request_id,
             'document': self.document_filename or '',
-            'event': self.event_type,
+            'event': self.event_type.value if self.event_type else '',
             'details': self.details,
             'ai_result': self.ai_result or '',
             'user_decision': self.user_decision or ''
         }
+
+    def to_row(self) -> tuple[str, ...]:
+        """Convert to a CSV row ordered like AUDIT_CSV_FIELDS.
+
+        Returns:
+            Tuple of formatted field values
+
+        """
+        return (
+            self.logged_at.strftime('%Y-%m-%d %H:%M:%S'),
+            self.request_id,
+            self.document_filename or '',
+            self.event_type.value if self.event_type else '',
+            self.details,
+            self.ai_result or '',
+            self.user_decision or '',
+        )
@@ -9,6 +9,7 @@ class Classification(str, Enum):
     RESPONSIVE = "responsive"
     NON_RESPONSIVE = "non_responsive"
     UNCERTAIN = "uncertain"
+    DUPLICATE = "duplicate"
 
     @property
     def display_name(self) -> str:
@@ -20,7 +21,8 @@ class Classification(str, Enum):
         """Create Classification from string value."""
         if not value:
             return None
-        try:
-            return cls(value.lower())
-        except ValueError:
-            return None
+        return _BY_VALUE.get(value.lower())
+
+
+# Lookup table for from_string; avoids raising ValueError for unknown values
+_BY_VALUE = {member.value: member for member in Classification}
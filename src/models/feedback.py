@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class FeedbackEntry:
     """Represents a single user correction to an AI classification."""
 
@@ -7,7 +7,7 @@ from pathlib import Path
 from uuid import uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class FOIARequest:
     """Represents a single FOIA request being processed"""
 
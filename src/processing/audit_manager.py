@@ -1,9 +1,47 @@
 """Audit manager for logging and tracking all document processing activities.
 """
 import csv
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
 from pathlib import Path
 
-from ..models.audit import AuditEntry
+from ..models.audit import AUDIT_CSV_FIELDS, AuditEntry, EventType
+
+logger = logging.getLogger(__name__)
+
+# Detail templates for the high-volume log_* events
+_CLASSIFY_TMPL = "AI Classification - Confidence: %.2f"
+_RULE_CLASSIFY_TMPL = "Rule-based Classification (no AI) - %s"
+_REVIEW_OVERRIDE = "User Review - Override"
+_REVIEW_APPROVED = "User Review - Approved"
+_VIEW_TMPL = "Document viewed in %s"
+_EXPORT_TMPL = "Export %s - %d documents"
+_ERROR_TMPL = "Error: %s"
+
+
+def _embedding_details(success: bool, processing_time: float | None = None,
+                       error_message: str | None = None) -> str:
+    """Describe an embedding generation result."""
+    if success:
+        details = "Embedding generated successfully"
+        if processing_time:
+            details += f" in {processing_time:.2f}s"
+        return details
+    return f"Embedding generation failed: {error_message or 'Unknown error'}"
+
+
+def _duplicate_details(is_duplicate: bool, duplicate_of: str | None,
+                       similarity_score: float | None) -> str:
+    """Describe a duplicate detection result."""
+    if not is_duplicate:
+        return "Marked as original document (no duplicates found)"
+    if similarity_score == 1.0:
+        return f"Marked as exact duplicate of {duplicate_of}"
+    details = f"Marked as duplicate of {duplicate_of}"
+    if similarity_score:
+        details += f" ({similarity_score:.1%} similar)"
+    return details
 
 
 class AuditManager:
@@ -12,6 +50,20 @@ class AuditManager:
     def __init__(self):
         """Initialize empty audit log."""
         self._entries: list[AuditEntry] = []
+        # Positions in _entries by request ID and by document filename
+        self._by_request: dict[str, list[int]] = defaultdict(list)
+        self._by_doc: dict[str, list[int]] = defaultdict(list)
+        # Unique (filename, request_id) pairs for the document filter list
+        self._doc_pairs: set[tuple[str, str]] = set()
+
+    def _add_entry(self, entry: AuditEntry) -> None:
+        """Append an entry and index it for filtering."""
+        position = len(self._entries)
+        self._entries.append(entry)
+        self._by_request[entry.request_id].append(position)
+        if entry.document_filename:
+            self._by_doc[entry.document_filename].append(position)
+            self._doc_pairs.add((entry.document_filename, entry.request_id))
 
     def log_classification(self, filename: str, result: str,
                          confidence: float, request_id: str) -> None:
@@ -24,18 +76,38 @@ class AuditManager:
             request_id: The FOIA request ID
 
         """
-        import logging
-        logger = logging.getLogger(__name__)
-        
         entry = AuditEntry(
             request_id=request_id,
             document_filename=filename,
-            event_type="classify",
+            event_type=EventType.CLASSIFY,
             ai_result=result,
-            details=f"AI Classification - Confidence: {confidence:.2f}"
+            details=_CLASSIFY_TMPL % confidence
         )
-        self._entries.append(entry)
-        logger.info(f"🔍 AUDIT MANAGER: Added classification entry for {filename}. Total entries: {len(self._entries)}")
+        self._add_entry(entry)
+        logger.debug(
+            "Added classification entry for %s. Total entries: %d",
+            filename, len(self._entries),
+        )
+
+    def log_rule_classification(self, filename: str, result: str,
+                                rule: str, request_id: str) -> None:
+        """Log a classification made by a rule without calling the AI.
+
+        Args:
+            filename: The document filename
+            result: The classification result
+            rule: Description of the rule that applied
+            request_id: The FOIA request ID
+
+        """
+        entry = AuditEntry(
+            request_id=request_id,
+            document_filename=filename,
+            event_type=EventType.CLASSIFY,
+            ai_result=result,
+            details=_RULE_CLASSIFY_TMPL % rule
+        )
+        self._add_entry(entry)
 
     def log_review(self, filename: str, ai_result: str,
                   user_decision: str, request_id: str) -> None:
@@ -48,18 +120,17 @@ class AuditManager:
             request_id: The FOIA request ID
 
         """
-        override = ai_result != user_decision
-        details = f"User Review - {'Override' if override else 'Approved'}"
+        details = _REVIEW_OVERRIDE if ai_result != user_decision else _REVIEW_APPROVED
 
         entry = AuditEntry(
             request_id=request_id,
             document_filename=filename,
-            event_type="review",
+            event_type=EventType.REVIEW,
             ai_result=ai_result,
             user_decision=user_decision,
             details=details
         )
-        self._entries.append(entry)
+        self._add_entry(entry)
 
     def log_view(self, filename: str, tab_name: str, request_id: str) -> None:
         """Log a document view event.
@@ -73,10 +144,10 @@ class AuditManager:
         entry = AuditEntry(
             request_id=request_id,
             document_filename=filename,
-            event_type="view",
-            details=f"Document viewed in {tab_name}"
+            event_type=EventType.VIEW,
+            details=_VIEW_TMPL % tab_name
         )
-        self._entries.append(entry)
+        self._add_entry(entry)
 
     def log_export(self, format: str, document_count: int,
                   request_id: str, selected_files: list[str] | None = None) -> None:
@@ -89,19 +160,18 @@ class AuditManager:
             selected_files: List of selected filenames (optional)
 
         """
-        details = f"Export {format} - {document_count} documents"
+        details = _EXPORT_TMPL % (format, document_count)
         if selected_files:
-            details += f" (Selected: {', '.join(selected_files[:3])}"
-            if len(selected_files) > 3:
-                details += f" and {len(selected_files) - 3} more"
-            details += ")"
+            more = len(selected_files) - 3
+            suffix = f" and {more} more" if more > 0 else ""
+            details = f"{details} (Selected: {', '.join(selected_files[:3])}{suffix})"
 
         entry = AuditEntry(
             request_id=request_id,
-            event_type="export",
+            event_type=EventType.EXPORT,
             details=details
         )
-        self._entries.append(entry)
+        self._add_entry(entry)
 
     def log_error(self, filename: str | None, error_message: str,
                  request_id: str) -> None:
@@ -116,10 +186,10 @@ class AuditManager:
         entry = AuditEntry(
             request_id=request_id,
             document_filename=filename,
-            event_type="error",
-            details=f"Error: {error_message}"
+            event_type=EventType.ERROR,
+            details=_ERROR_TMPL % (error_message,)
         )
-        self._entries.append(entry)
+        self._add_entry(entry)
 
     def get_entries(self, request_id: str | None = None,
                    document_filter: list[str] | None = None) -> list[AuditEntry]:
@@ -133,18 +203,21 @@ class AuditManager:
             List of matching audit entries
 
         """
-        entries = self._entries
+        if not request_id and not document_filter:
+            return self._entries
 
-        # Filter by request ID if provided
-        if request_id:
-            entries = [e for e in entries if e.request_id == request_id]
-
-        # Filter by documents if provided
-        if document_filter:
-            entries = [e for e in entries
-                      if e.document_filename in document_filter]
-
-        return entries
+        entries = self._entries
+        if not document_filter:
+            return [entries[position] for position in self._by_request.get(request_id, [])]
+
+        # Gather the documents' positions and check the request in the same pass
+        positions = sorted(
+            position
+            for filename in frozenset(document_filter)
+            for position in self._by_doc.get(filename, ())
+            if not request_id or entries[position].request_id == request_id
+        )
+        return [entries[position] for position in positions]
 
     def export_csv(self, filepath: Path) -> None:
         """Export all audit entries to CSV file.
@@ -156,18 +229,11 @@ class AuditManager:
         # Sort entries chronologically
         entries = sorted(self._entries, key=lambda e: e.timestamp)
 
-        # Write to CSV
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ['timestamp', 'request_id', 'document',
-                         'event', 'details', 'ai_result', 'user_decision']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-            # Write header
-            writer.writeheader()
-
-            # Write entries
-            for entry in entries:
-                writer.writerow(entry.to_dict())
+        # Write to CSV with a large buffer and a single writerows call
+        with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(AUDIT_CSV_FIELDS)
+            writer.writerows(entry.to_row() for entry in entries)
 
     def get_all_documents(self) -> list[tuple[str, str]]:
         """Get all unique document-request pairs for filtering.
@@ -176,14 +242,7 @@ class AuditManager:
             List of (filename, request_id) tuples
 
         """
-        doc_request_pairs = set()
-
-        for entry in self._entries:
-            if entry.document_filename:
-                doc_request_pairs.add((entry.document_filename, entry.request_id))
-
-        # Return sorted list
-        return sorted(list(doc_request_pairs))
+        return sorted(self._doc_pairs)
 
     def log_embedding(self, filename: str, request_id: str, 
                      success: bool, processing_time: float | None = None,
@@ -198,24 +257,17 @@ class AuditManager:
             error_message: Error message if failed (optional)
 
         """
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        if success:
-            details = "Embedding generated successfully"
-            if processing_time:
-                details += f" in {processing_time:.2f}s"
-        else:
-            details = f"Embedding generation failed: {error_message or 'Unknown error'}"
-        
         entry = AuditEntry(
             request_id=request_id,
             document_filename=filename,
-            event_type="embedding",
-            details=details
+            event_type=EventType.EMBEDDING,
+            details=_embedding_details(success, processing_time, error_message)
+        )
+        self._add_entry(entry)
+        logger.debug(
+            "Added embedding entry for %s. Total entries: %d",
+            filename, len(self._entries),
         )
-        self._entries.append(entry)
-        logger.info(f"🔍 AUDIT MANAGER: Added embedding entry for {filename}. Total entries: {len(self._entries)}")
 
     def log_duplicate(self, filename: str, request_id: str, 
                      is_duplicate: bool, duplicate_of: str | None = None,
@@ -230,23 +282,49 @@ class AuditManager:
             similarity_score: Similarity score if near-duplicate
 
         """
-        if is_duplicate:
-            if similarity_score == 1.0:
-                details = f"Marked as exact duplicate of {duplicate_of}"
-            else:
-                details = f"Marked as duplicate of {duplicate_of}"
-                if similarity_score:
-                    details += f" ({similarity_score:.1%} similar)"
-        else:
-            details = "Marked as original document (no duplicates found)"
-        
         entry = AuditEntry(
             request_id=request_id,
             document_filename=filename,
-            event_type="duplicate",
-            details=details
+            event_type=EventType.DUPLICATE,
+            details=_duplicate_details(is_duplicate, duplicate_of, similarity_score)
         )
-        self._entries.append(entry)
+        self._add_entry(entry)
+
+    def log_embeddings(self, request_id: str,
+                       results: Iterable[tuple[str, bool]]) -> None:
+        """Log embedding generation for many documents at once.
+
+        Args:
+            request_id: The FOIA request ID
+            results: (filename, success) pairs
+
+        """
+        count = len(self._entries)
+        for filename, success in results:
+            self._add_entry(AuditEntry(
+                request_id=request_id,
+                document_filename=filename,
+                event_type=EventType.EMBEDDING,
+                details=_embedding_details(success)
+            ))
+        logger.debug("Added %d embedding entries", len(self._entries) - count)
+
+    def log_duplicates(self, request_id: str,
+                       results: Iterable[tuple[str, bool, str | None, float | None]]) -> None:
+        """Log duplicate detection for many documents at once.
+
+        Args:
+            request_id: The FOIA request ID
+            results: (filename, is_duplicate, duplicate_of, similarity_score) tuples
+
+        """
+        for filename, is_duplicate, duplicate_of, similarity_score in results:
+            self._add_entry(AuditEntry(
+                request_id=request_id,
+                document_filename=filename,
+                event_type=EventType.DUPLICATE,
+                details=_duplicate_details(is_duplicate, duplicate_of, similarity_score)
+            ))
 
     def get_entry_count(self) -> int:
         """Get total number of audit entries.
@@ -1,22 +1,166 @@
 """In-memory document storage with request isolation.
 """
 
+import sys
 from collections import defaultdict
 from typing import Any
 
 from src.models.document import Document
 
+# Shared empty mapping for reads of unknown requests; never mutated
+_EMPTY: dict[str, Document] = {}
+
+# Canonical string objects for classification values, so the many copies
+# produced by the classifier share one object and compare by identity first
+_CLASSIFICATION_VALUES = {
+    value: sys.intern(value)
+    for value in (
+        "responsive",
+        "non_responsive",
+        "non-responsive",
+        "uncertain",
+        "duplicate",
+    )
+}
+
+# Statistics bucket for each effective classification
+_STATISTIC_KEYS = {
+    "responsive": "responsive",
+    "non-responsive": "non_responsive",
+    "uncertain": "uncertain",
+}
+
+# Fields update_document may set; all are Document slots, so no hasattr check
+_UPDATABLE_FIELDS = frozenset(
+    {
+        "classification",
+        "confidence",
+        "justification",
+        "exemptions",
+        "human_decision",
+        "human_feedback",
+        "is_duplicate",
+        "duplicate_of",
+        "similarity_score",
+    }
+)
+assert _UPDATABLE_FIELDS <= set(Document.__slots__)
+
+
+def _empty_statistics() -> dict[str, int]:
+    """Create zeroed statistics counters"""
+    return {
+        "total": 0,
+        "reviewed": 0,
+        "responsive": 0,
+        "non_responsive": 0,
+        "uncertain": 0,
+        "has_exemptions": 0,
+    }
+
 
 class DocumentStore:
     """In-memory document storage with request isolation"""
 
     def __init__(self) -> None:
         # Store documents by request_id -> filename -> Document
-        self._documents: dict[str, dict[str, Document]] = defaultdict(dict)
+        self._documents: dict[str, dict[str, Document]] = {}
+
+        # Secondary indexes by request_id, kept in sync by add_document and
+        # update_document. A document is bucketed under both its AI
+        # classification and its human decision.
+        self._by_class: dict[str, dict[str | None, set[str]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        self._reviewed: dict[str, set[str]] = defaultdict(set)
+        self._unreviewed: dict[str, set[str]] = defaultdict(set)
+        # Insertion position of each filename, to return results in store order
+        self._positions: dict[str, dict[str, int]] = defaultdict(dict)
+        # (classification, human_decision, has_exemptions) each filename is
+        # indexed under. Callers may mutate a Document before calling
+        # update_document, so the old values cannot be read back from it.
+        self._indexed: dict[str, dict[str, tuple[str | None, str | None, bool]]] = (
+            defaultdict(dict)
+        )
+        # Statistics counters, adjusted as documents are indexed
+        self._stats: dict[str, dict[str, int]] = defaultdict(_empty_statistics)
+
+    def _index(self, request_id: str, document: Document) -> None:
+        """Move a document into the buckets for its current field values"""
+        if document.classification is not None:
+            document.classification = _CLASSIFICATION_VALUES.get(
+                document.classification, document.classification
+            )
+        if document.human_decision is not None:
+            document.human_decision = _CLASSIFICATION_VALUES.get(
+                document.human_decision, document.human_decision
+            )
+
+        filename = document.filename
+        indexed = self._indexed[request_id]
+        by_class = self._by_class[request_id]
+
+        stats = self._stats[request_id]
+
+        previous = indexed.get(filename)
+        if previous is None:
+            stats["total"] += 1
+        else:
+            by_class[previous[0]].discard(filename)
+            by_class[previous[1]].discard(filename)
+            self._count(stats, previous, -1)
+
+        current = (
+            document.classification,
+            document.human_decision,
+            bool(document.exemptions),
+        )
+        indexed[filename] = current
+        by_class[current[0]].add(filename)
+        by_class[current[1]].add(filename)
+        self._count(stats, current, 1)
+
+        if document.human_decision is None:
+            self._reviewed[request_id].discard(filename)
+            self._unreviewed[request_id].add(filename)
+        else:
+            self._unreviewed[request_id].discard(filename)
+            self._reviewed[request_id].add(filename)
+
+    @staticmethod
+    def _count(
+        stats: dict[str, int],
+        indexed: tuple[str | None, str | None, bool],
+        delta: int,
+    ) -> None:
+        """Add or remove one document's contribution to the statistics"""
+        classification, human_decision, has_exemptions = indexed
+
+        if human_decision is not None:
+            stats["reviewed"] += delta
+
+        # Use human decision if available, otherwise AI classification
+        key = _STATISTIC_KEYS.get(human_decision or classification)
+        if key:
+            stats[key] += delta
+
+        if has_exemptions:
+            stats["has_exemptions"] += delta
+
+    def _select(self, request_id: str, filenames: set[str]) -> list[Document]:
+        """Get documents for indexed filenames in store order"""
+        if not filenames:
+            return []
+        documents = self._documents[request_id]
+        positions = self._positions[request_id]
+        return list(map(documents.__getitem__, sorted(filenames, key=positions.__getitem__)))
 
     def add_document(self, request_id: str, document: Document) -> None:
         """Add document to request-specific store"""
-        self._documents[request_id][document.filename] = document
+        positions = self._positions[request_id]
+        positions.setdefault(document.filename, len(positions))
+        self._documents.setdefault(request_id, {})[document.filename] = document
+        self._index(request_id, document)
 
     def add_documents(self, request_id: str, documents: list[Document]) -> None:
         """Add multiple documents to request-specific store"""
@@ -25,33 +169,28 @@ class DocumentStore:
 
     def get_document(self, request_id: str, filename: str) -> Document | None:
         """Get a specific document by filename"""
-        return self._documents[request_id].get(filename)
+        return self._documents.get(request_id, _EMPTY).get(filename)
 
     def get_documents(self, request_id: str) -> list[Document]:
         """Get all documents for a request"""
-        return list(self._documents[request_id].values())
+        return list(self._documents.get(request_id, _EMPTY).values())
 
     def get_documents_by_classification(
         self, request_id: str, classification: str
     ) -> list[Document]:
         """Get documents with a specific classification"""
-        documents = self.get_documents(request_id)
-        return [
-            doc
-            for doc in documents
-            if doc.classification == classification
-            or doc.human_decision == classification
-        ]
+        by_class = self._by_class.get(request_id)
+        if not by_class or classification not in by_class:
+            return []
+        return self._select(request_id, by_class[classification])
 
     def get_unreviewed_documents(self, request_id: str) -> list[Document]:
         """Get documents that haven't been reviewed"""
-        documents = self.get_documents(request_id)
-        return [doc for doc in documents if doc.human_decision is None]
+        return self._select(request_id, self._unreviewed.get(request_id, set()))
 
     def get_reviewed_documents(self, request_id: str) -> list[Document]:
         """Get documents that have been reviewed"""
-        documents = self.get_documents(request_id)
-        return [doc for doc in documents if doc.human_decision is not None]
+        return self._select(request_id, self._reviewed.get(request_id, set()))
 
     def update_document(self, request_id: str, filename: str, **kwargs: Any) -> bool:
         """Update document fields"""
@@ -60,69 +199,45 @@ class DocumentStore:
             return False
 
         # Update allowed fields
-        allowed_fields = {
-            "classification",
-            "confidence",
-            "justification",
-            "exemptions",
-            "human_decision",
-            "human_feedback",
-            "is_duplicate",
-            "duplicate_of",
-            "similarity_score",
-        }
-
-        for field, value in kwargs.items():
-            if field in allowed_fields and hasattr(document, field):
-                setattr(document, field, value)
+        for field in _UPDATABLE_FIELDS.intersection(kwargs):
+            setattr(document, field, kwargs[field])
 
+        self._index(request_id, document)
         return True
 
     def get_document_count(self, request_id: str) -> int:
         """Get total number of documents for a request"""
-        return len(self._documents[request_id])
+        return len(self._documents.get(request_id, _EMPTY))
 
     def clear_request(self, request_id: str) -> None:
         """Clear all documents for a request"""
         if request_id in self._documents:
             del self._documents[request_id]
+        for index in self._indexes():
+            index.pop(request_id, None)
 
     def clear_all(self) -> None:
         """Clear all documents (for testing purposes)"""
         self._documents.clear()
+        for index in self._indexes():
+            index.clear()
+
+    def _indexes(self) -> tuple[dict, ...]:
+        """Get the per-request secondary indexes"""
+        return (
+            self._by_class,
+            self._reviewed,
+            self._unreviewed,
+            self._positions,
+            self._indexed,
+            self._stats,
+        )
 
     def get_statistics(self, request_id: str) -> dict[str, int]:
         """Get classification statistics for a request"""
-        documents = self.get_documents(request_id)
-
-        stats = {
-            "total": len(documents),
-            "reviewed": 0,
-            "responsive": 0,
-            "non_responsive": 0,
-            "uncertain": 0,
-            "has_exemptions": 0,
-        }
-
-        for doc in documents:
-            # Use human decision if available, otherwise AI classification
-            classification = doc.human_decision or doc.classification
-
-            if doc.human_decision is not None:
-                stats["reviewed"] += 1
-
-            if classification == "responsive":
-                stats["responsive"] += 1
-            elif classification == "non-responsive":
-                stats["non_responsive"] += 1
-            elif classification == "uncertain":
-                stats["uncertain"] += 1
-
-            if doc.exemptions:
-                stats["has_exemptions"] += 1
-
-        return stats
+        stats = self._stats.get(request_id)
+        return dict(stats) if stats else _empty_statistics()
 
     def has_documents(self, request_id: str) -> bool:
         """Check if a request has any documents"""
-        return request_id in self._documents and len(self._documents[request_id]) > 0
+        return bool(self._documents.get(request_id))
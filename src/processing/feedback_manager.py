@@ -4,6 +4,7 @@ import logging
 from collections import defaultdict
 from typing import Any
 
+from src.langgraph.nodes.pre_classifier import compile_feedback_rules
 from src.models.document import Document
 from src.models.feedback import FeedbackEntry
 
@@ -16,6 +17,19 @@ class FeedbackManager:
     def __init__(self) -> None:
         # Store feedback by request_id
         self._feedback: dict[str, list[FeedbackEntry]] = defaultdict(list)
+        # Prompt examples by request_id, tagged with the feedback version they
+        # were built from; the version changes on every add or clear
+        self._version: dict[str, int] = defaultdict(int)
+        self._examples_cache: dict[str, tuple[int, list[dict[str, Any]]]] = {}
+        # Pre-classifier rules by request_id, tagged the same way
+        self._rules_cache: dict[str, tuple[int, dict[str, tuple[str, int, int]]]] = {}
+        # Correction counts by request_id ("original → human" -> count) and
+        # the most common correction, updated as feedback is added
+        self._corrections: dict[str, dict[str, int]] = defaultdict(dict)
+        self._top_correction: dict[str, str] = {}
+        # Identical snippets (the same document corrected again) share one
+        # string per request
+        self._snippets: dict[str, dict[str, str]] = defaultdict(dict)
 
     def add_feedback(
         self,
@@ -41,9 +55,12 @@ class FeedbackManager:
             return None
 
         # Create document snippet (first 200 chars)
-        snippet = document.content[:200] if document.content else ""
-        if len(document.content) > 200:
-            snippet += "..."
+        content = document.content
+        if not content:
+            snippet = ""
+        else:
+            snippet = content if len(content) <= 200 else content[:200] + "..."
+            snippet = self._snippets[request_id].setdefault(snippet, snippet)
 
         # Don't hardcode any classification rules - let the user's feedback speak for itself
         correction_reason = ""
@@ -59,13 +76,30 @@ class FeedbackManager:
         )
 
         self._feedback[request_id].append(entry)
+        self._version[request_id] += 1
+        self._count_correction(request_id, entry)
         logger.debug(
-            f"Recorded feedback for {document.filename}: "
-            f"{entry.original_classification} -> {human_decision}"
+            "Recorded feedback for %s: %s -> %s",
+            document.filename, entry.original_classification, human_decision,
         )
 
         return entry
 
+    def _count_correction(self, request_id: str, entry: FeedbackEntry) -> None:
+        """Update correction counts and the most common correction."""
+        counts = self._corrections[request_id]
+        key = f"{entry.original_classification} → {entry.human_decision}"
+        counts[key] = counts.get(key, 0) + 1
+
+        top = self._top_correction.get(request_id)
+        if top is None or counts[key] > counts[top]:
+            self._top_correction[request_id] = key
+        elif counts[key] == counts[top] and key != top:
+            # Ties go to the correction seen first
+            keys = list(counts)
+            if keys.index(key) < keys.index(top):
+                self._top_correction[request_id] = key
+
     def get_all_feedback(self, request_id: str) -> list[dict[str, Any]]:
         """Get all feedback for a request formatted for prompts.
         
@@ -73,29 +107,59 @@ class FeedbackManager:
             request_id: The FOIA request ID
             
         Returns:
-            List of feedback examples formatted for inclusion in prompts
+            List of feedback examples formatted for inclusion in prompts.
+            The list is shared between calls until feedback changes, so
+            callers must not modify it.
 
         """
         feedback_list = self._feedback.get(request_id, [])
 
         # Log summary only
         if feedback_list:
-            logger.info(f"Loading {len(feedback_list)} feedback examples for request {request_id}")
+            logger.info(
+                "Loading %d feedback examples for request %s", len(feedback_list), request_id
+            )
+
+        version = self._version[request_id]
+        cached = self._examples_cache.get(request_id)
+        if cached and cached[0] == version:
+            return cached[1]
 
         # Convert to format for prompt
-        examples = []
-        for feedback in feedback_list:
-            examples.append({
+        examples = [
+            {
                 "document_filename": feedback.document_id,
                 "document_snippet": feedback.document_snippet,
                 "ai_classification": feedback.original_classification,
                 "human_correction": feedback.human_decision,
                 "confidence": feedback.original_confidence,
-                "correction_reason": getattr(feedback, 'correction_reason', '')
-            })
+                "correction_reason": feedback.correction_reason,
+            }
+            for feedback in feedback_list
+        ]
+        self._examples_cache[request_id] = (version, examples)
+        return examples
 
+    def get_feedback_rules(self, request_id: str) -> dict[str, tuple[str, int, int]]:
+        """Get filename prefix rules compiled from a request's feedback.
 
-        return examples
+        Args:
+            request_id: The FOIA request ID
+
+        Returns:
+            Mapping of filename prefix to (classification, supporting
+            corrections, corrections for the prefix). Shared between calls
+            until feedback changes, so callers must not modify it.
+
+        """
+        version = self._version[request_id]
+        cached = self._rules_cache.get(request_id)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        rules = compile_feedback_rules(self.get_all_feedback(request_id))
+        self._rules_cache[request_id] = (version, rules)
+        return rules
 
     def get_statistics(self, request_id: str) -> dict[str, Any]:
         """Get feedback statistics for a request.
@@ -115,18 +179,10 @@ class FeedbackManager:
                 "most_corrected_type": "N/A"
             }
 
-        # Count correction types
-        corrections: dict[str, int] = defaultdict(int)
-        for f in feedback_list:
-            key = f"{f.original_classification} → {f.human_decision}"
-            corrections[key] += 1
-
-        most_common = max(corrections.items(), key=lambda x: x[1]) if corrections else ("N/A", 0)
-
         return {
             "total_corrections": len(feedback_list),
-            "most_corrected_type": most_common[0],
-            "correction_counts": dict(corrections)
+            "most_corrected_type": self._top_correction[request_id],
+            "correction_counts": dict(self._corrections[request_id])
         }
 
     def clear_feedback(self, request_id: str) -> None:
@@ -140,6 +196,12 @@ class FeedbackManager:
             count = len(self._feedback[request_id])
             del self._feedback[request_id]
             logger.info(f"Cleared {count} feedback entries for request {request_id}")
+        self._snippets.pop(request_id, None)
+        self._examples_cache.pop(request_id, None)
+        self._rules_cache.pop(request_id, None)
+        self._corrections.pop(request_id, None)
+        self._top_correction.pop(request_id, None)
+        self._version[request_id] += 1
 
     def has_feedback(self, request_id: str) -> bool:
         """Check if a request has any feedback.
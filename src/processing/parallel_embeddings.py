@@ -3,33 +3,61 @@
 import logging
 import multiprocessing as mp
 import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from dataclasses import dataclass
+from itertools import chain, islice
 from pathlib import Path
-from queue import Empty, Queue
+from queue import Queue
 from typing import Any
 
+import numpy as np
+
+from src.langgraph.nodes.document_loader import read_text_with_hash
 from src.models.document import Document
+from src.processing.worker_pool import WorkerPool, drain, split_exits
+from src.services.embedding_cache import CachedEmbeddingClient
 from src.services.embedding_service import EmbeddingService
 from src.services.embedding_store import EmbeddingStore
 
 logger = logging.getLogger(__name__)
 
+# Minimum cosine similarity for a near duplicate
+_SIMILARITY_THRESHOLD = 0.85
+
+# Maximum results handled together in one duplicate-detection window
+_RESULT_WINDOW = 32
+
+# Minimum seconds between progress callbacks; each one becomes a Qt signal
+_PROGRESS_INTERVAL = 0.05
 
-@dataclass
+# Threads reading and hashing documents before they are queued for the workers
+_READ_THREADS = 8
+# Reads submitted but not yet batched
+_READ_AHEAD = 2 * _READ_THREADS
+
+
+@dataclass(slots=True, frozen=True)
 class EmbeddingTask:
     """Represents a single embedding generation task."""
     task_id: int
     document_path: Path
     request_id: str
+    # Read once in the main process, which keeps it for the result
+    content: str
+    content_hash: str
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddingResult:
     """Result of embedding generation."""
     task_id: int
     filename: str | None = None
     content: str | None = None
-    embedding: list[float] | None = None
+    # float32 so the result pickles as one buffer rather than a list of floats
+    embedding: np.ndarray | None = None
     content_hash: str | None = None
     document: Document | None = None  # Added back for the main process to set
     error: str | None = None
@@ -52,6 +80,7 @@ class ParallelEmbeddingProcessor:
         self._progress_callback: Any = None
         self._error_callback: Any = None
         self._document_callback: Any = None
+        self._pool: WorkerPool | None = None
 
     def set_progress_callback(self, callback: Any) -> None:
         """Set callback for progress updates."""
@@ -85,25 +114,16 @@ class ParallelEmbeddingProcessor:
         self._total_documents = len(document_paths)
         self._documents_processed = 0
 
-        # Create tasks
-        tasks = [
-            EmbeddingTask(
-                task_id=idx,
-                document_path=path,
-                request_id=request_id
-            )
-            for idx, path in enumerate(document_paths)
-        ]
-
-        # Create batches for workers
-        batch_size = max(1, len(tasks) // (self.num_workers * 4))
-        batches = [
-            tasks[i:i + batch_size]
-            for i in range(0, len(tasks), batch_size)
-        ]
-
-        # Process batches in parallel
-        results = self._process_batches(batches, embedding_store)
+        # Documents are read and hashed as the workers make room for them;
+        # exact duplicates and unreadable files are resolved while reading
+        # and never queued for embedding
+        batch_size = max(1, len(document_paths) // (self.num_workers * 4))
+        resolved: list[EmbeddingResult] = []
+        with closing(self._read_batches(
+            document_paths, request_id, embedding_store, batch_size, resolved
+        )) as batches:
+            embedded = self._process_batches(batches, batch_size, request_id, embedding_store)
+        results = resolved + embedded
 
         # Convert results to document metadata dictionary
         doc_metadata = {}
@@ -111,139 +131,305 @@ class ParallelEmbeddingProcessor:
         for result in results:
             if result.document:
                 # Map back to original file path using task_id
-                doc_path = tasks[result.task_id].document_path
+                doc_path = document_paths[result.task_id]
                 doc_metadata[doc_path] = result.document
 
         return doc_metadata
 
-    def _process_batches(
-        self, 
-        batches: list[list[EmbeddingTask]], 
-        embedding_store: EmbeddingStore
-    ) -> list[EmbeddingResult]:
-        """Process batches of documents using worker pool."""
-        # Create queues for communication
-        task_queue: Queue = mp.Queue()
-        result_queue: Queue = mp.Queue()
-
-        # Start worker processes
-        workers = []
-        for _ in range(self.num_workers):
-            worker = mp.Process(
-                target=process_embedding_batch,
-                args=(task_queue, result_queue)
-            )
-            worker.start()
-            workers.append(worker)
-
-        # Submit batches to queue (no need to send embedding store anymore)
-        for batch in batches:
-            task_queue.put(batch)
-
-        # Signal workers to stop when done
-        for _ in range(self.num_workers):
-            task_queue.put(None)
+    def _read_batches(
+        self,
+        document_paths: list[Path],
+        request_id: str,
+        embedding_store: EmbeddingStore,
+        batch_size: int,
+        resolved: list[EmbeddingResult]
+    ) -> Iterator[list[EmbeddingTask]]:
+        """Read and hash documents, yielding batches that still need embeddings.
 
-        # Collect results and perform duplicate detection in real-time
-        results = []
-        expected_results = sum(len(batch) for batch in batches)
-        request_id = batches[0][0].request_id if batches and batches[0] else ""
+        Reads run at most _READ_AHEAD documents ahead, and the next batch is
+        only read when it is asked for, so content not yet queued stays bounded.
+
+        Args:
+            document_paths: List of document paths to process
+            request_id: The request ID for duplicate detection scope
+            embedding_store: The embedding store instance
+            batch_size: Number of tasks per yielded batch
+            resolved: Receives results for exact duplicates and unreadable
+                documents as they are read
 
-        while len(results) < expected_results:
+        Yields:
+            Batches of tasks still needing an embedding
+        """
+        batch: list[EmbeddingTask] = []
+        # Content hashes of this run's originals, for copies in later batches
+        originals: dict[str, str] = {}
+
+        with ThreadPoolExecutor(max_workers=_READ_THREADS) as read_pool:
             try:
-                result = result_queue.get(timeout=1.0)
-                
-                # Perform duplicate detection in main process
-                if not result.error and result.content_hash:
-                    # Check for exact duplicate first
-                    exact_match = embedding_store.find_exact(request_id, result.content_hash)
+                pending_paths = iter(enumerate(document_paths))
+                reads = deque(
+                    (idx, path, read_pool.submit(_read_document, path))
+                    for idx, path in islice(pending_paths, _READ_AHEAD)
+                )
+
+                while reads:
+                    idx, path, read = reads.popleft()
+                    next_path = next(pending_paths, None)
+                    if next_path is not None:
+                        next_idx, next_doc = next_path
+                        reads.append(
+                            (next_idx, next_doc, read_pool.submit(_read_document, next_doc))
+                        )
+
+                    content, content_hash, error, read_time = read.result()
+                    exact_match = None
+                    if error is None:
+                        exact_match = embedding_store.find_exact(
+                            request_id, content_hash
+                        ) or originals.get(content_hash)
+                        if not exact_match:
+                            originals[content_hash] = path.name
+                            batch.append(EmbeddingTask(
+                                task_id=idx,
+                                document_path=path,
+                                request_id=request_id,
+                                content=content,
+                                content_hash=content_hash
+                            ))
+                            if len(batch) == batch_size:
+                                yield batch
+                                batch = []
+                            continue
+
+                    result = EmbeddingResult(
+                        task_id=idx,
+                        filename=path.name,
+                        error=error,
+                        processing_time=read_time
+                    )
                     if exact_match:
-                        # Create document as exact duplicate
-                        document = Document(
-                            filename=result.filename,
-                            content=result.content,
-                            content_hash=result.content_hash,
+                        result.content = content
+                        result.content_hash = content_hash
+                        result.document = Document(
+                            filename=path.name,
+                            content=content,
+                            content_hash=content_hash,
                             is_duplicate=True,
                             duplicate_of=exact_match,
                             similarity_score=1.0,
                             embedding_generated=False
                         )
-                    elif result.embedding:
-                        # Check for similar documents
-                        similar_docs = embedding_store.find_similar(
-                            request_id, result.embedding, threshold=0.85
-                        )
-                        
-                        if similar_docs:
-                            # Near duplicate found
-                            document = Document(
-                                filename=result.filename,
-                                content=result.content,
-                                content_hash=result.content_hash,
-                                is_duplicate=True,
-                                duplicate_of=similar_docs[0][0],
-                                similarity_score=similar_docs[0][1],
-                                embedding_generated=True
-                            )
-                        else:
-                            # Original document
-                            document = Document(
-                                filename=result.filename,
-                                content=result.content,
-                                content_hash=result.content_hash,
-                                is_duplicate=False,
-                                embedding_generated=True
-                            )
-                        
-                        # Store embedding for future comparisons
-                        embedding_store.add_embedding(
-                            request_id, result.filename, 
-                            result.embedding, result.content_hash
-                        )
-                    else:
-                        # No embedding generated
-                        document = Document(
-                            filename=result.filename,
-                            content=result.content,
-                            content_hash=result.content_hash,
-                            is_duplicate=False,
-                            embedding_generated=False
-                        )
-                    
-                    # Add document to result
-                    result.document = document
-                    
+                        if self._document_callback:
+                            self._document_callback(result.document)
+                    resolved.append(result)
+                    self._documents_processed += 1
+
+                if batch:
+                    yield batch
+            finally:
+                # Closed early when the workers fail; drop reads not yet started
+                read_pool.shutdown(cancel_futures=True)
+
+    def _process_batches(
+        self, 
+        batches: Iterator[list[EmbeddingTask]], 
+        batch_size: int,
+        request_id: str,
+        embedding_store: EmbeddingStore
+    ) -> list[EmbeddingResult]:
+        """Queue batches for the worker pool as it makes room and collect results."""
+        first_batch = next(batches, None)
+        if first_batch is None:
+            # Every document was resolved while reading
+            if self._progress_callback:
+                self._progress_callback(self._documents_processed, self._total_documents)
+            return []
+
+        # Start worker processes, or reuse the ones from an earlier call
+        if self._pool is None:
+            self._pool = WorkerPool(process_embedding_batch, self.num_workers)
+        pool = self._pool
+        pool.start()
+        result_queue = pool.result_queue
+
+        # Further batches are read only while fewer documents than this are
+        # queued or being embedded, bounding the content pickled ahead of the workers
+        max_pending = 2 * self.num_workers * batch_size
+        batches = chain([first_batch], batches)
+        # Workers don't send content back; results take it from the tasks
+        contents: dict[int, str] = {}
+
+        # Collect results and perform duplicate detection in real-time
+        results = []
+        submitted = 0
+        exhausted = False
+
+        failed_workers: list[mp.Process] = []
+        stopping = False
+        exited = 0
+        last_progress = 0.0
+        # Block until results or exit notices arrive; once every worker has
+        # exited, everything they sent has been received
+        with pool.watch_exits():
+            while exited < len(pool.workers):
+                # Top up the task queue (no need to send embedding store anymore)
+                while not (exhausted or stopping) and submitted - len(results) < max_pending:
+                    batch = next(batches, None)
+                    if batch is None:
+                        exhausted = True
+                        break
+                    contents.update((task.task_id, task.content) for task in batch)
+                    pool.task_queue.put(batch)
+                    submitted += len(batch)
+                if exhausted and len(results) == submitted:
+                    break
+
+                # Handle every result that has already arrived in one window
+                window, exits = split_exits(drain(result_queue, _RESULT_WINDOW))
+                for result in window:
+                    result.content = contents.pop(result.task_id)
+
+                # Perform duplicate detection in main process
+                self._detect_duplicates(window, request_id, embedding_store)
+
+                for result in window:
                     # Notify about completed document
-                    if self._document_callback:
-                        self._document_callback(document)
-                
-                results.append(result)
-                self._documents_processed += 1
-
-                # Update progress
-                if self._progress_callback:
+                    if result.document and self._document_callback:
+                        self._document_callback(result.document)
+
+                    results.append(result)
+                    self._documents_processed += 1
+
+                # Update progress once per window, at most every _PROGRESS_INTERVAL
+                now = time.monotonic()
+                if self._progress_callback and (
+                    now - last_progress >= _PROGRESS_INTERVAL
+                    or self._documents_processed == self._total_documents
+                ):
                     self._progress_callback(
                         self._documents_processed, self._total_documents
                     )
-                    
-            except Empty:
-                # Check if any workers died
-                for worker in workers:
-                    if not worker.is_alive() and worker.exitcode != 0:
+                    last_progress = now
+
+                if not exits:
+                    continue
+                exited += exits
+                # Report each dead worker once
+                for worker in pool.workers:
+                    if worker.exitcode and worker not in failed_workers:
+                        failed_workers.append(worker)
                         if self._error_callback:
                             self._error_callback(
                                 f"Worker process died with exit code {worker.exitcode}"
                             )
-
-        # Wait for workers to finish
-        for worker in workers:
-            worker.join(timeout=5.0)
-            if worker.is_alive():
-                worker.terminate()
-                worker.join()
+                # A dead worker's batch never arrives, so stop reading and let
+                # the others finish what is queued and exit instead of idling
+                if failed_workers and not stopping:
+                    pool.request_stop()
+                    stopping = True
+
+        unprocessed = self._total_documents - self._documents_processed
+        if unprocessed:
+            # Report where processing stopped; the final window may have been throttled
+            if self._progress_callback:
+                self._progress_callback(self._documents_processed, self._total_documents)
+            if self._error_callback:
+                self._error_callback(f"{unprocessed} documents were not processed")
+
+        # After a worker death the remaining workers were asked to exit;
+        # reap them so the next call starts a fresh pool
+        if failed_workers:
+            pool.stop()
 
         return results
 
+    def _detect_duplicates(
+        self,
+        window: list[EmbeddingResult],
+        request_id: str,
+        embedding_store: EmbeddingStore
+    ) -> None:
+        """Mark a window of results as originals or duplicates, in arrival order.
+
+        Similarities against the store and within the window are computed
+        with one matrix product each; results are then resolved in order so
+        each is compared with everything stored before it.
+        """
+        embedded = [
+            result for result in window
+            if not result.error and result.content_hash and result.embedding is not None
+        ]
+        store_matches = embedding_store.find_similar_batch(
+            request_id, [result.embedding for result in embedded],
+            threshold=_SIMILARITY_THRESHOLD
+        )
+        window_similarities = _pairwise_similarities(
+            [result.embedding for result in embedded]
+        )
+        row_of = {id(result): row for row, result in enumerate(embedded)}
+        stored_rows: list[int] = []
+
+        for result in window:
+            if result.error or not result.content_hash:
+                continue
+
+            # Check for exact duplicate first
+            exact_match = embedding_store.find_exact(request_id, result.content_hash)
+            if exact_match:
+                # Create document as exact duplicate
+                result.document = Document(
+                    filename=result.filename,
+                    content=result.content,
+                    content_hash=result.content_hash,
+                    is_duplicate=True,
+                    duplicate_of=exact_match,
+                    similarity_score=1.0,
+                    embedding_generated=False
+                )
+            elif result.embedding is not None:
+                # Best match among stored documents, then among this window's
+                # documents stored since; ties go to the earlier document
+                row = row_of[id(result)]
+                best = store_matches[row][0] if store_matches[row] else None
+                for other in stored_rows:
+                    similarity = float(window_similarities[row, other])
+                    if similarity >= _SIMILARITY_THRESHOLD and (
+                        best is None or similarity > best[1]
+                    ):
+                        best = (embedded[other].filename, similarity)
+
+                result.document = Document(
+                    filename=result.filename,
+                    content=result.content,
+                    content_hash=result.content_hash,
+                    is_duplicate=best is not None,
+                    duplicate_of=best[0] if best else None,
+                    similarity_score=best[1] if best else None,
+                    embedding_generated=True
+                )
+
+                # Store embedding for future comparisons
+                embedding_store.add_embedding(
+                    request_id, result.filename,
+                    result.embedding, result.content_hash
+                )
+                stored_rows.append(row)
+            else:
+                # No embedding generated
+                result.document = Document(
+                    filename=result.filename,
+                    content=result.content,
+                    content_hash=result.content_hash,
+                    is_duplicate=False,
+                    embedding_generated=False
+                )
+
+    def close(self) -> None:
+        """Stop the worker processes kept between calls."""
+        if self._pool is not None:
+            self._pool.stop()
+            self._pool = None
+
     def get_processing_rate(self) -> float:
         """Get the current processing rate in documents per minute."""
         if not self._start_time or self._documents_processed == 0:
@@ -256,6 +442,23 @@ class ParallelEmbeddingProcessor:
         return (self._documents_processed / elapsed_time) * 60
 
 
+def _pairwise_similarities(embeddings: list[np.ndarray]) -> np.ndarray:
+    """Cosine similarity between every pair of embeddings.
+
+    Args:
+        embeddings: Embedding vectors of equal length
+
+    Returns:
+        Square similarity matrix; zero vectors have similarity 0
+    """
+    if not embeddings:
+        return np.empty((0, 0), dtype=np.float32)
+    matrix = np.stack(embeddings).astype(np.float32, copy=False)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    return matrix @ matrix.T
+
+
 def process_embedding_batch(
     task_queue: Queue,
     result_queue: Queue,
@@ -266,9 +469,6 @@ def process_embedding_batch(
         task_queue: Queue to receive processing tasks
         result_queue: Queue to send results
     """
-    # Create embedding service in worker process
-    embedding_service = EmbeddingService()
-    
     # Set process title for monitoring
     try:
         import setproctitle
@@ -276,51 +476,88 @@ def process_embedding_batch(
     except ImportError:
         pass
 
+    # Create embedding service in worker process; the on-disk cache skips
+    # documents embedded in earlier runs
+    embedding_service = EmbeddingService()
+    with closing(CachedEmbeddingClient(embedding_service)) as embedding_client:
+        _embed_batches(task_queue, result_queue, embedding_client)
+
+
+def _read_document(document_path: Path) -> tuple[str | None, str | None, str | None, float]:
+    """Read and hash one document.
+
+    Args:
+        document_path: Path to the document
+
+    Returns:
+        Tuple of (content, content hash, error message, elapsed seconds)
+    """
+    start_time = time.time()
+    try:
+        content, content_hash = read_text_with_hash(document_path)
+    except Exception as e:
+        return None, None, str(e), time.time() - start_time
+    return content, content_hash, None, time.time() - start_time
+
+
+def _embed_batches(
+    task_queue: Queue,
+    result_queue: Queue,
+    embedding_client: CachedEmbeddingClient,
+) -> None:
+    """Embed batches from the task queue until the stop sentinel arrives.
+
+    Tasks carry the content the main process already read, so each batch
+    needs only one embeddings call.
+
+    Args:
+        task_queue: Queue to receive processing tasks
+        result_queue: Queue to send results
+        embedding_client: Cached client used for embeddings
+    """
     while True:
         try:
             # Get next batch
-            batch = task_queue.get(timeout=1.0)
+            batch = task_queue.get()
             if batch is None:
                 # Sentinel value - time to stop
                 break
 
-            # Process each document in the batch
-            for task in batch:
-                start_time = time.time()
-                try:
-                    # Read document content
-                    content = task.document_path.read_text(encoding="utf-8")
-                    
-                    # Generate content hash
-                    content_hash = embedding_service.generate_content_hash(content)
-                    
-                    # Generate embedding
-                    embedding = embedding_service.generate_embedding(content)
-                    
-                    processing_time = time.time() - start_time
-                    result = EmbeddingResult(
-                        task_id=task.task_id,
-                        filename=task.document_path.name,
-                        content=content,
-                        embedding=embedding,
-                        content_hash=content_hash,
-                        processing_time=processing_time
-                    )
-
-                except Exception as e:
-                    processing_time = time.time() - start_time
-                    result = EmbeddingResult(
+            # Generate embeddings for the whole batch; the call's time is
+            # shared evenly between its documents
+            start_time = time.time()
+            try:
+                embeddings = embedding_client.get_or_compute(
+                    [task.content for task in batch],
+                    [task.content_hash for task in batch],
+                )
+            except Exception as e:
+                # The collector waits for every task, so report each one
+                logger.error("Embedding failed for a batch of %d documents: %s", len(batch), e)
+                embed_time = (time.time() - start_time) / len(batch)
+                for task in batch:
+                    result_queue.put(EmbeddingResult(
                         task_id=task.task_id,
                         filename=task.document_path.name,
                         error=str(e),
-                        processing_time=processing_time
-                    )
-
-                result_queue.put(result)
+                        processing_time=embed_time
+                    ))
+                continue
+            embed_time = (time.time() - start_time) / len(batch)
+
+            for task, embedding in zip(batch, embeddings, strict=True):
+                result_queue.put(EmbeddingResult(
+                    task_id=task.task_id,
+                    filename=task.document_path.name,
+                    embedding=(
+                        None if embedding is None
+                        else np.asarray(embedding, dtype=np.float32)
+                    ),
+                    content_hash=task.content_hash,
+                    processing_time=embed_time
+                ))
 
-        except Empty:
-            continue
         except Exception as e:
             # Critical error - log and continue
             logger.error(f"Embedding worker error: {e}")
-            continue
\ No newline at end of file
+            continue
@@ -4,18 +4,30 @@ import logging
 import multiprocessing as mp
 import time
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from multiprocessing import Queue
 from pathlib import Path
-from queue import Empty
 from typing import Any
 
+from src.langgraph import workflow as workflow_module
+from src.langgraph.nodes.document_loader import read_text
 from src.models.document import Document
+from src.processing.worker_pool import WorkerPool, drain, split_exits
 
 logger = logging.getLogger(__name__)
 
+# Threads per worker reading documents ahead of the workflow
+_READ_THREADS = 2
 
-@dataclass
+# Maximum results handled together in one collection window
+_RESULT_WINDOW = 32
+
+# Minimum seconds between progress callbacks; each one becomes a Qt signal
+_PROGRESS_INTERVAL = 0.05
+
+
+@dataclass(slots=True)
 class ProcessingTask:
     """Represents a document processing task."""
 
@@ -25,11 +37,13 @@ class ProcessingTask:
     feedback_examples: list[dict] | None = None
     embedding_metadata: Document | None = None
     request_id: str | None = None
+    # Filename prefix rules compiled from feedback_examples
+    feedback_rules: dict[str, tuple[str, int, int]] | None = None
     # Note: audit_manager can't be passed directly due to multiprocessing serialization
     # Instead, we'll create a proxy that sends audit events back to main process
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AuditEvent:
     """Represents an audit event to be logged."""
     event_type: str
@@ -47,9 +61,10 @@ class AuditProxy:
     
     def log_classification(self, filename: str, result: str, confidence: float, request_id: str) -> None:
         """Log an AI classification event."""
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"🔍 AUDIT PROXY: Logging classification for {filename}: {result} ({confidence:.2f})")
+        logger.debug(
+            "Audit proxy logging classification for %s: %s (%.2f)",
+            filename, result, confidence,
+        )
         
         self.events.append(AuditEvent(
             event_type="classification",
@@ -58,6 +73,15 @@ class AuditProxy:
             details={"result": result, "confidence": confidence}
         ))
     
+    def log_rule_classification(self, filename: str, result: str, rule: str, request_id: str) -> None:
+        """Log a rule-based classification event."""
+        self.events.append(AuditEvent(
+            event_type="rule_classification",
+            filename=filename,
+            request_id=request_id,
+            details={"result": result, "rule": rule}
+        ))
+
     def log_error(self, filename: str | None, error_message: str, request_id: str) -> None:
         """Log an error event."""
         self.events.append(AuditEvent(
@@ -68,7 +92,7 @@ class AuditProxy:
         ))
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """Represents the result of a document processing task."""
 
@@ -77,7 +101,10 @@ class ProcessingResult:
     error: str | None = None
     processing_time: float = 0.0
     audit_events: list[AuditEvent] = None  # Audit events to be logged in main process
-    
+    # True when the document's content was left out because the main process
+    # already holds it in the task's embedding metadata
+    content_omitted: bool = False
+
     def __post_init__(self):
         if self.audit_events is None:
             self.audit_events = []
@@ -108,6 +135,7 @@ class ParallelDocumentProcessor:
         self._total_documents = 0
         self._duplicate_count = 0
         self._start_time: float | None = None
+        self._pool: WorkerPool | None = None
 
     def set_progress_callback(self, callback: Callable[[int, int], None]) -> None:
         """Set the progress callback function."""
@@ -131,7 +159,8 @@ class ParallelDocumentProcessor:
         foia_request: str,
         feedback_examples: list[dict] | None = None,
         embedding_metadata: dict[Path, Document] | None = None,
-        request_id: str | None = None
+        request_id: str | None = None,
+        feedback_rules: dict[str, tuple[str, int, int]] | None = None
     ) -> list[Document]:
         """Process multiple documents in parallel.
 
@@ -140,6 +169,7 @@ class ParallelDocumentProcessor:
             foia_request: The FOIA request text for context
             feedback_examples: List of feedback examples for few-shot learning
             embedding_metadata: Dictionary mapping paths to Document objects with embedding data
+            feedback_rules: Filename prefix rules compiled from the feedback examples
 
         Returns:
             List of processed Document objects
@@ -156,7 +186,8 @@ class ParallelDocumentProcessor:
                 task_id=idx,
                 feedback_examples=feedback_examples,
                 embedding_metadata=embedding_metadata.get(path) if embedding_metadata else None,
-                request_id=request_id
+                request_id=request_id,
+                feedback_rules=feedback_rules
             )
             for idx, path in enumerate(document_paths)
         ]
@@ -178,10 +209,16 @@ class ParallelDocumentProcessor:
         # Process batches in parallel
         results = self._process_batches(batches)
 
-        # Sort results by original order and extract documents
-        results.sort(key=lambda r: r.task_id)
-        documents = []
+        # Task IDs are positions in document_paths, so place each result
+        # directly in its slot instead of sorting
+        ordered: list[ProcessingResult | None] = [None] * len(tasks)
         for result in results:
+            ordered[result.task_id] = result
+
+        documents = []
+        for result in ordered:
+            if result is None:
+                continue
             if result.document:
                 documents.append(result.document)
             elif result.error and self._error_callback:
@@ -204,8 +241,14 @@ class ParallelDocumentProcessor:
     def _create_batches(
         self, tasks: list[ProcessingTask]
     ) -> list[list[ProcessingTask]]:
-        """Divide tasks into batches for processing."""
+        """Divide tasks into batches for processing.
+
+        Workers pull batches from a shared queue, so queueing the largest
+        documents first keeps one big file from finishing the run alone.
+        Results are mapped back to the original order by task_id.
+        """
         batch_size = self.batch_size or self._calculate_optimal_batch_size(len(tasks))
+        tasks = sorted(tasks, key=_document_size, reverse=True)
         batches = []
         for i in range(0, len(tasks), batch_size):
             batch = tasks[i : i + batch_size]
@@ -216,86 +259,118 @@ class ParallelDocumentProcessor:
         self, batches: list[list[ProcessingTask]]
     ) -> list[ProcessingResult]:
         """Process batches of documents using worker pool."""
-        # Create queues for communication
-        task_queue: Queue = mp.Queue()  # type: ignore
-        result_queue: Queue = mp.Queue()  # type: ignore
-
-        # Start worker processes
-        workers = []
-        for _ in range(self.num_workers):
-            worker = mp.Process(
-                target=process_document_batch,
-                args=(
-                    None,
-                    task_queue,
-                    result_queue,
-                ),  # Pass None, workflow created in worker
-            )
-            worker.start()
-            workers.append(worker)
+        if not batches:
+            return []
+
+        # Start worker processes, or reuse the ones from an earlier call
+        if self._pool is None:
+            # Compile here so forked workers inherit the workflow ready-built
+            workflow_module.get_compiled_workflow()
+            # Pass None, workflow fetched in worker
+            self._pool = WorkerPool(process_document_batch, self.num_workers, (None,))
+        pool = self._pool
+        pool.start()
+        result_queue = pool.result_queue
 
         # Submit batches to queue
         for batch in batches:
-            task_queue.put(batch)
-
-        # Signal workers to stop when done
-        for _ in range(self.num_workers):
-            task_queue.put(None)
+            pool.task_queue.put(batch)
+        tasks_by_id = {task.task_id: task for batch in batches for task in batch}
 
         # Collect results
         results = []
         expected_results = sum(len(batch) for batch in batches)
 
-        while len(results) < expected_results:
-            try:
-                result = result_queue.get(timeout=1.0)
-                results.append(result)
-                
-                # Only count non-duplicates in progress
-                if result.document and result.document.classification != "duplicate":
-                    self._documents_processed += 1
-
-                # Update progress - adjust total by duplicate count
-                if self._progress_callback:
-                    adjusted_total = self._total_documents - self._duplicate_count
-                    self._progress_callback(
-                        self._documents_processed, adjusted_total
-                    )
+        failed_workers: list[mp.Process] = []
+        stopping = False
+        exited = 0
+        last_progress = 0.0
+        # Block until results or exit notices arrive; once every worker has
+        # exited, everything they sent has been received
+        with pool.watch_exits():
+            while len(results) < expected_results and exited < len(pool.workers):
+                # Handle every result that has already arrived together
+                window, exits = split_exits(drain(result_queue, _RESULT_WINDOW))
+                audit_events: list[AuditEvent] = []
+                for result in window:
+                    results.append(result)
+                    if result.content_omitted and result.document:
+                        result.document.content = (
+                            tasks_by_id[result.task_id].embedding_metadata.content
+                        )
 
-                # Notify about completed document immediately
-                if result.document and self._document_callback:
-                    self._document_callback(result.document)
-                
-                # Process audit events
-                if result.audit_events:
-                    logger.info(f"🔍 PARALLEL PROCESSOR: Received {len(result.audit_events)} audit events for processing")
+                    # Only count non-duplicates in progress
+                    if result.document and result.document.classification != "duplicate":
+                        self._documents_processed += 1
+
+                    # Notify about completed document immediately
+                    if result.document and self._document_callback:
+                        self._document_callback(result.document)
+
+                    audit_events.extend(result.audit_events)
+
+                # Update progress once per window, at most every _PROGRESS_INTERVAL
+                now = time.monotonic()
+                if now - last_progress >= _PROGRESS_INTERVAL or len(results) == expected_results:
+                    self._report_progress()
+                    last_progress = now
+
+                # Process the window's audit events with one callback
+                if audit_events:
+                    logger.debug(
+                        "Received %d audit events from %d results",
+                        len(audit_events), len(window),
+                    )
                     if self._audit_callback:
-                        self._audit_callback(result.audit_events)
+                        self._audit_callback(audit_events)
                     else:
-                        logger.warning(f"🔍 PARALLEL PROCESSOR: No audit callback set!")
-                else:
-                    logger.info(f"🔍 PARALLEL PROCESSOR: No audit events in result")
-            except Empty:
-                # Check if any workers died
-                for worker in workers:
-                    if (
-                        not worker.is_alive()
-                        and worker.exitcode != 0
-                        and self._error_callback
-                    ):
-                        self._error_callback(
-                            f"Worker process died with exit code {worker.exitcode}"
-                        )
+                        logger.warning("No audit callback set; dropping %d audit events",
+                                       len(audit_events))
+
+                if not exits:
+                    continue
+                exited += exits
+                # Report each dead worker once
+                for worker in pool.workers:
+                    if worker.exitcode and worker not in failed_workers:
+                        failed_workers.append(worker)
+                        if self._error_callback:
+                            self._error_callback(
+                                f"Worker process died with exit code {worker.exitcode}"
+                            )
+                # A dead worker's batch never arrives, so let the others finish
+                # what is queued and exit instead of idling
+                if failed_workers and not stopping:
+                    pool.request_stop()
+                    stopping = True
+
+        if len(results) < expected_results:
+            # Report where processing stopped; the final window may have been throttled
+            self._report_progress()
+            if self._error_callback:
+                self._error_callback(
+                    f"{expected_results - len(results)} documents were not processed"
+                )
 
-        # Wait for workers to finish
-        for worker in workers:
-            worker.join(timeout=5.0)
-            if worker.is_alive():
-                worker.terminate()
-                worker.join()
+        # After a worker death the remaining workers were asked to exit;
+        # reap them so the next call starts a fresh pool
+        if failed_workers:
+            pool.stop()
 
         return results
 
+    def _report_progress(self) -> None:
+        """Send progress to the callback, excluding duplicates from the total."""
+        if self._progress_callback:
+            adjusted_total = self._total_documents - self._duplicate_count
+            self._progress_callback(self._documents_processed, adjusted_total)
+
+    def close(self) -> None:
+        """Stop the worker processes kept between calls."""
+        if self._pool is not None:
+            self._pool.stop()
+            self._pool = None
+
     def get_processing_rate(self) -> float:
         """Get the current processing rate in documents per minute."""
         if not self._start_time or self._documents_processed == 0:
@@ -308,6 +383,34 @@ class ParallelDocumentProcessor:
         return (self._documents_processed / elapsed_time) * 60
 
 
+def _document_size(task: ProcessingTask) -> int:
+    """Size of a task's document in bytes, or 0 if it cannot be read."""
+    try:
+        return task.document_path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _submit_reads(
+    read_pool: ThreadPoolExecutor, batch: list[ProcessingTask]
+) -> dict[int, Future[str]]:
+    """Start reading the documents in a batch that have no embedding content.
+
+    Args:
+        read_pool: Executor to read on
+        batch: Tasks about to be processed
+
+    Returns:
+        Pending reads by task ID
+
+    """
+    return {
+        task.task_id: read_pool.submit(read_text, task.document_path)
+        for task in batch
+        if task.embedding_metadata is None or task.embedding_metadata.content is None
+    }
+
+
 def process_document_batch(
     workflow_factory: Any,  # This will be None, we'll create workflow in worker
     task_queue: Queue,
@@ -321,11 +424,9 @@ def process_document_batch(
         result_queue: Queue to send results
 
     """
-    # Import here to avoid pickling issues
-    from src.langgraph.workflow import get_compiled_workflow
-
     # Create workflow in the worker process
-    workflow = get_compiled_workflow()
+    workflow = workflow_module.get_compiled_workflow()
+    create_initial_state = workflow_module.create_initial_state
 
     # Set process title for monitoring
     try:
@@ -335,32 +436,40 @@ def process_document_batch(
     except ImportError:
         pass
 
+    # Reads run ahead on threads so the next document is in memory by the
+    # time the workflow finishes the current one
+    read_pool = ThreadPoolExecutor(_READ_THREADS, thread_name_prefix="foia-read")
+
     while True:
         try:
             # Get next batch
-            batch = task_queue.get(timeout=1.0)
+            batch = task_queue.get()
             if batch is None:
                 # Sentinel value - time to stop
                 break
 
+            reads = _submit_reads(read_pool, batch)
+
             # Process each document in the batch
             for task in batch:
                 start_time = time.time()
                 audit_proxy = AuditProxy(task.request_id)
                 
                 try:
-                    # Read document content
-                    content = task.document_path.read_text(encoding="utf-8")
+                    # Reuse the content read during embedding when available
+                    content_omitted = task.task_id not in reads
+                    if content_omitted:
+                        content = task.embedding_metadata.content
+                    else:
+                        content = reads.pop(task.task_id).result()
 
-                    # Import here to avoid pickling issues
-                    from src.langgraph.workflow import create_initial_state
-                    
                     # Create initial state using the proper function
                     state = create_initial_state(task.document_path.name, task.foia_request)
                     
                     # Add content and other fields
                     state["content"] = content
                     state["feedback_examples"] = task.feedback_examples
+                    state["feedback_rules"] = task.feedback_rules
                     state["audit_manager"] = audit_proxy
                     state["request_id"] = task.request_id
                     
@@ -378,7 +487,8 @@ def process_document_batch(
                     # Create document from state
                     document = Document(
                         filename=final_state["filename"],
-                        content=final_state["content"],
+                        # Not sent back when the main process already has it
+                        content="" if content_omitted else final_state["content"],
                         classification=final_state.get("classification"),
                         confidence=final_state.get("confidence"),
                         justification=final_state.get("justification"),
@@ -395,16 +505,17 @@ def process_document_batch(
 
                     processing_time = time.time() - start_time
                     
-                    # Debug logging
-                    logger.info(f"🔍 WORKER: Processing complete for {task.document_path.name}, audit events: {len(audit_proxy.events)}")
-                    for event in audit_proxy.events:
-                        logger.info(f"🔍 WORKER: Event {event.event_type} for {event.filename}")
-                    
+                    logger.debug(
+                        "Processing complete for %s, audit events: %d",
+                        task.document_path.name, len(audit_proxy.events),
+                    )
+
                     result = ProcessingResult(
                         task_id=task.task_id,
                         document=document,
                         processing_time=processing_time,
                         audit_events=audit_proxy.events,
+                        content_omitted=content_omitted,
                     )
 
                 except Exception as e:
@@ -426,9 +537,9 @@ def process_document_batch(
 
                 result_queue.put(result)
 
-        except Empty:
-            continue
         except Exception as e:
             # Critical error - log and continue
             logger.error(f"Worker error: {e}")
             continue
+
+    read_pool.shutdown()
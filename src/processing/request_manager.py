@@ -11,6 +11,8 @@ class RequestManager:
 
     def __init__(self) -> None:
         self._requests: dict[str, FOIARequest] = {}
+        # Newest first; requests created in the same clock tick keep creation order
+        self._order: list[FOIARequest] = []
         self._active_request_id: str | None = None
 
     def create_request(self, name: str, description: str = "") -> FOIARequest:
@@ -18,6 +20,15 @@ class RequestManager:
         request = FOIARequest(name=name, description=description)
         self._requests[request.id] = request
 
+        # A new request is almost always the newest, so its slot is at the front
+        position = 0
+        while (
+            position < len(self._order)
+            and self._order[position].created_at >= request.created_at
+        ):
+            position += 1
+        self._order.insert(position, request)
+
         # Set as active if it's the first request
         if not self._active_request_id:
             self._active_request_id = request.id
@@ -43,12 +54,12 @@ class RequestManager:
 
     def list_requests(self) -> list[FOIARequest]:
         """List all requests sorted by creation date"""
-        return sorted(self._requests.values(), key=lambda r: r.created_at, reverse=True)
+        return list(self._order)
 
     def delete_request(self, request_id: str) -> bool:
         """Delete a request and its associated data"""
         if request_id in self._requests:
-            del self._requests[request_id]
+            self._order.remove(self._requests.pop(request_id))
 
             # Update active request if needed
             if self._active_request_id == request_id:
@@ -96,4 +107,5 @@ class RequestManager:
     def clear_all_requests(self) -> None:
         """Clear all requests (for testing purposes)"""
         self._requests.clear()
+        self._order.clear()
         self._active_request_id = None
@@ -1,25 +1,98 @@
 """Background worker thread for LangGraph document processing."""
 
 import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from itertools import islice
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
 from ..constants import SUPPORTED_FILE_EXTENSION
+from ..langgraph.nodes.document_loader import read_text, read_text_with_hash
 from ..langgraph.workflow import get_compiled_workflow
 from ..models.document import Document
+from ..services.embedding_cache import CachedEmbeddingClient
 from ..services.embedding_service import EmbeddingService
 from ..services.embedding_store import EmbeddingStore
+from ..services.minhash import NearDuplicateIndex
 from .parallel_embeddings import ParallelEmbeddingProcessor
 from .parallel_worker import ParallelDocumentProcessor
 
 logger = logging.getLogger(__name__)
 
+# Threads reading documents ahead of duplicate checks in the sequential pass
+_READ_THREADS = 4
+# Reads submitted but not yet consumed in the sequential pass
+_READ_AHEAD = 2 * _READ_THREADS
+
+# Documents per embedding call in the sequential pass; progress and
+# cancellation are checked between calls
+_EMBED_BATCH_SIZE = 100
+
 if TYPE_CHECKING:
     from .audit_manager import AuditManager
     from .feedback_manager import FeedbackManager
 
+# Processors are shared across runs so their worker processes are reused
+_embedding_processor: ParallelEmbeddingProcessor | None = None
+_document_processor: ParallelDocumentProcessor | None = None
+
+
+def _shared_embedding_processor() -> ParallelEmbeddingProcessor:
+    """Get the embedding processor shared by all processing runs."""
+    global _embedding_processor
+    if _embedding_processor is None:
+        _embedding_processor = ParallelEmbeddingProcessor()
+    return _embedding_processor
+
+
+def _shared_document_processor() -> ParallelDocumentProcessor:
+    """Get the document processor shared by all processing runs."""
+    global _document_processor
+    if _document_processor is None:
+        _document_processor = ParallelDocumentProcessor()
+    return _document_processor
+
+
+def shutdown_workers() -> None:
+    """Stop the worker processes kept by the shared processors.
+
+    Workers are daemonic, so they would also be terminated at interpreter
+    exit; stopping them here lets them exit cleanly when the app quits.
+    """
+    global _embedding_processor, _document_processor
+    for processor in (_embedding_processor, _document_processor):
+        if processor is not None:
+            processor.close()
+    _embedding_processor = None
+    _document_processor = None
+
+
+def _list_text_files(folder: Path) -> list[Path]:
+    """List the supported files in a folder with a single directory scan.
+
+    ``os.scandir`` returns the file type with each entry, so this skips the
+    pattern matching and per-entry ``Path`` work of ``Path.glob``.
+
+    Args:
+        folder: Folder to scan (not recursive)
+
+    Returns:
+        Paths of regular files with the supported extension
+
+    """
+    suffix = SUPPORTED_FILE_EXTENSION.lstrip("*")
+    with os.scandir(folder) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(suffix) and entry.is_file()
+        ]
+
 
 class ProcessingWorker(QThread):
     """Background thread for processing documents with LangGraph.
@@ -99,10 +172,12 @@ class ProcessingWorker(QThread):
         # Parallel processor (created when needed)
         self._parallel_processor: ParallelDocumentProcessor | None = None
 
-        # Get feedback examples if available
+        # Get feedback examples (and the rules compiled from them) if available
         self.feedback_examples = []
+        self.feedback_rules: dict[str, tuple[str, int, int]] = {}
         if self.feedback_manager and self.request_id:
             self.feedback_examples = self.feedback_manager.get_all_feedback(self.request_id)
+            self.feedback_rules = self.feedback_manager.get_feedback_rules(self.request_id)
 
     def cancel(self) -> None:
         """Cancel the processing operation."""
@@ -116,7 +191,7 @@ class ProcessingWorker(QThread):
                 txt_files = self.file_list
             else:
                 # Get all text files in the folder
-                txt_files = list(self.folder_path.glob(SUPPORTED_FILE_EXTENSION))
+                txt_files = _list_text_files(self.folder_path)
 
             self.stats["total"] = len(txt_files)
 
@@ -131,11 +206,11 @@ class ProcessingWorker(QThread):
             # Phase 2: Process documents through classification workflow
             if self.use_parallel and len(txt_files) > 3:
                 # Use parallel processing for 4+ documents
-                logger.info(f"🔍 WORKER: Using PARALLEL processing for {len(txt_files)} documents")
+                logger.info("Using parallel processing for %d documents", len(txt_files))
                 self._process_parallel(txt_files)
             else:
                 # Use sequential processing for small batches
-                logger.info(f"🔍 WORKER: Using SEQUENTIAL processing for {len(txt_files)} documents")
+                logger.info("Using sequential processing for %d documents", len(txt_files))
                 self._process_sequential(txt_files)
 
             # Calculate the final non-duplicate count AFTER processing
@@ -158,144 +233,174 @@ class ProcessingWorker(QThread):
         """
         # Choose between parallel and sequential processing based on file count
         if len(txt_files) > 5:  # Use parallel for more than 5 files
-            logger.info(f"🔍 WORKER: Using PARALLEL embedding generation for {len(txt_files)} documents")
+            logger.info("Using parallel embedding generation for %d documents", len(txt_files))
             self._generate_embeddings_parallel(txt_files)
         else:
-            logger.info(f"🔍 WORKER: Using SEQUENTIAL embedding generation for {len(txt_files)} documents")
+            logger.info("Using sequential embedding generation for %d documents", len(txt_files))
             self._generate_embeddings_sequential(txt_files)
 
     def _generate_embeddings_sequential(self, txt_files: list[Path]) -> None:
-        """Generate embeddings sequentially (for small file sets)."""
-        duplicate_count = 0
+        """Generate embeddings sequentially (for small file sets).
 
-        for idx, doc_path in enumerate(txt_files):
-            if self._is_cancelled:
-                break
+        Exact duplicates are resolved while reading. Everything else is
+        embedded in cached, batched calls and stored, so later runs can
+        match against it; documents MinHash already matched keep that match,
+        and the rest are checked for similar documents in their original order.
 
-            # Update progress
-            self.status_updated.emit(f"Generating embeddings... ({idx+1}/{len(txt_files)})")
-            self.embedding_progress.emit(idx + 1, len(txt_files))
+        Args:
+            txt_files: List of document paths to process
 
+        """
+        duplicate_count = 0
+        # Lexical near duplicates within this run are caught by MinHash
+        near_duplicate_index = NearDuplicateIndex()
+        # Content hashes of this run's originals, for exact matches before storing
+        originals: dict[str, str] = {}
+        to_embed: list[tuple[Path, str, str, tuple[str, float] | None]] = []
+
+        # Reads run ahead on threads while earlier files are hashed and checked;
+        # the window bounds how much unconsumed content is held in memory
+        with ThreadPoolExecutor(_READ_THREADS, thread_name_prefix="foia-read") as read_pool:
             try:
-                # Load content
-                content = doc_path.read_text(encoding='utf-8')
-                content_hash = self.embedding_service.generate_content_hash(content)
-
-                # Check for exact duplicate first
-                exact_match = self.embedding_store.find_exact(
-                    self.request_id, content_hash
+                pending_paths = iter(txt_files)
+                reads = deque(
+                    (doc_path, read_pool.submit(read_text_with_hash, doc_path))
+                    for doc_path in islice(pending_paths, _READ_AHEAD)
                 )
 
-                if exact_match:
-                    # Mark as exact duplicate
-                    doc = Document(
-                        filename=doc_path.name,
-                        content=content,
-                        content_hash=content_hash,
-                        is_duplicate=True,
-                        duplicate_of=exact_match,
-                        similarity_score=1.0
-                    )
-                    duplicate_count += 1
-                    self.stats["duplicates"] = duplicate_count
-                    self.stats_updated.emit(self.stats.copy())
-                    
-                    # Log exact duplicate detection to audit trail
-                    if self.audit_manager:
-                        self.audit_manager.log_duplicate(
+                while reads:
+                    if self._is_cancelled:
+                        break
+
+                    doc_path, read = reads.popleft()
+                    next_path = next(pending_paths, None)
+                    if next_path is not None:
+                        reads.append((next_path, read_pool.submit(read_text_with_hash, next_path)))
+
+                    try:
+                        # Load content
+                        content, content_hash = read.result()
+
+                        # Check for exact duplicate first
+                        exact_match = self.embedding_store.find_exact(
+                            self.request_id, content_hash
+                        ) or originals.get(content_hash)
+                        if not exact_match:
+                            originals[content_hash] = doc_path.name
+                            near_duplicate = near_duplicate_index.find_or_insert(doc_path.name, content)
+                            to_embed.append((doc_path, content, content_hash, near_duplicate))
+                            continue
+
+                        self._document_metadata[doc_path] = Document(
                             filename=doc_path.name,
-                            request_id=self.request_id,
+                            content=content,
+                            content_hash=content_hash,
                             is_duplicate=True,
                             duplicate_of=exact_match,
                             similarity_score=1.0
                         )
-                else:
-                    # Generate embedding for similarity check
-                    embedding = self.embedding_service.generate_embedding(content)
+                        duplicate_count += 1
 
-                    # Log embedding generation to audit trail
-                    if self.audit_manager:
-                        self.audit_manager.log_embedding(
-                            filename=doc_path.name,
-                            request_id=self.request_id,
-                            success=embedding is not None
-                        )
-
-                    if embedding:
-                        # Check for near-duplicates
-                        similar_docs = self.embedding_store.find_similar(
-                            self.request_id, embedding, threshold=0.85
-                        )
-
-                        if similar_docs:
-                            # Mark as near-duplicate
-                            doc = Document(
+                        # Log exact duplicate detection to audit trail
+                        if self.audit_manager:
+                            self.audit_manager.log_duplicate(
                                 filename=doc_path.name,
-                                content=content,
-                                content_hash=content_hash,
+                                request_id=self.request_id,
                                 is_duplicate=True,
-                                duplicate_of=similar_docs[0][0],
-                                similarity_score=similar_docs[0][1],
-                                embedding_generated=True
+                                duplicate_of=exact_match,
+                                similarity_score=1.0
                             )
-                            duplicate_count += 1
-                            self.stats["duplicates"] = duplicate_count
-                            self.stats_updated.emit(self.stats.copy())
-                            
-                            # Log duplicate detection to audit trail
-                            if self.audit_manager:
-                                self.audit_manager.log_duplicate(
-                                    filename=doc_path.name,
-                                    request_id=self.request_id,
-                                    is_duplicate=True,
-                                    duplicate_of=similar_docs[0][0],
-                                    similarity_score=similar_docs[0][1]
-                                )
-                        else:
-                            # Original document
-                            doc = Document(
+
+                    except Exception as e:
+                        self._record_embedding_error(doc_path, e)
+            finally:
+                # Reads past a cancel are dropped rather than waited for
+                read_pool.shutdown(cancel_futures=True)
+
+        self.stats["duplicates"] = duplicate_count
+        self.stats_updated.emit(self.stats.copy())
+        self.embedding_progress.emit(len(txt_files) - len(to_embed), len(txt_files))
+
+        # Embed everything else a batch at a time, so progress is shown and a
+        # cancelled run stops making calls; cache misses within a batch are
+        # sent in packed requests
+        resolved = len(txt_files) - len(to_embed)
+        with closing(CachedEmbeddingClient(self.embedding_service)) as embedding_client:
+            for start in range(0, len(to_embed), _EMBED_BATCH_SIZE):
+                if self._is_cancelled:
+                    break
+
+                batch = to_embed[start:start + _EMBED_BATCH_SIZE]
+                self.status_updated.emit(
+                    f"Generating embeddings... ({resolved}/{len(txt_files)})"
+                )
+                embeddings = embedding_client.get_or_compute(
+                    [content for _, content, _, _ in batch],
+                    [content_hash for _, _, content_hash, _ in batch],
+                )
+
+                for (doc_path, content, content_hash, near_duplicate), embedding in zip(
+                    batch, embeddings, strict=True
+                ):
+                    try:
+                        # Log embedding generation to audit trail
+                        if self.audit_manager:
+                            self.audit_manager.log_embedding(
                                 filename=doc_path.name,
-                                content=content,
-                                content_hash=content_hash,
-                                is_duplicate=False,
-                                embedding_generated=True
+                                request_id=self.request_id,
+                                success=embedding is not None
                             )
-                            
-                            # Log as original document
-                            if self.audit_manager:
-                                self.audit_manager.log_duplicate(
-                                    filename=doc_path.name,
-                                    request_id=self.request_id,
-                                    is_duplicate=False
-                                )
-
-                        # Store embedding
-                        self.embedding_store.add_embedding(
-                            self.request_id, doc_path.name, embedding, content_hash
-                        )
-                    else:
-                        # Failed to generate embedding, treat as original
+
+                        duplicate_of: str | None = None
+                        similarity_score: float | None = None
+                        if near_duplicate:
+                            duplicate_of, similarity_score = near_duplicate
+                        elif embedding:
+                            # Check for near-duplicates
+                            similar_docs = self.embedding_store.find_similar(
+                                self.request_id, embedding, threshold=0.85
+                            )
+                            if similar_docs:
+                                duplicate_of, similarity_score = similar_docs[0]
+
                         doc = Document(
                             filename=doc_path.name,
                             content=content,
                             content_hash=content_hash,
-                            is_duplicate=False,
-                            embedding_generated=False
+                            is_duplicate=duplicate_of is not None,
+                            duplicate_of=duplicate_of,
+                            similarity_score=similarity_score,
+                            embedding_generated=embedding is not None
                         )
+                        if doc.is_duplicate:
+                            duplicate_count += 1
 
-                # Store document metadata for processing phase
-                self._document_metadata[doc_path] = doc
+                        # Log duplicate detection (or the original) to audit trail;
+                        # a failed embedding is treated as an original without a check
+                        if self.audit_manager and (embedding or near_duplicate):
+                            self.audit_manager.log_duplicate(
+                                filename=doc_path.name,
+                                request_id=self.request_id,
+                                is_duplicate=doc.is_duplicate,
+                                duplicate_of=duplicate_of,
+                                similarity_score=similarity_score
+                            )
 
-            except Exception as e:
-                logger.error(f"Error generating embedding for {doc_path.name}: {e}")
-                # Create basic document without embedding
-                doc = Document(
-                    filename=doc_path.name,
-                    content="",
-                    is_duplicate=False,
-                    embedding_generated=False
-                )
-                self._document_metadata[doc_path] = doc
+                        # Store embedding, MinHash duplicates included, so later runs
+                        # and the parallel path can match against every document
+                        if embedding:
+                            self.embedding_store.add_embedding(
+                                self.request_id, doc_path.name, embedding, content_hash
+                            )
+
+                        # Store document metadata for processing phase
+                        self._document_metadata[doc_path] = doc
+
+                    except Exception as e:
+                        self._record_embedding_error(doc_path, e)
+
+                resolved += len(batch)
+                self.embedding_progress.emit(resolved, len(txt_files))
 
         # Emit final duplicate count and stats
         self.duplicates_found.emit(duplicate_count)
@@ -303,12 +408,23 @@ class ProcessingWorker(QThread):
         self.stats_updated.emit(self.stats.copy())
         self.status_updated.emit(f"Embeddings complete. Duplicates found: {duplicate_count}")
 
+    def _record_embedding_error(self, doc_path: Path, error: Exception) -> None:
+        """Record a document whose embedding step failed as a plain original."""
+        logger.error(f"Error generating embedding for {doc_path.name}: {error}")
+        # Create basic document without embedding
+        self._document_metadata[doc_path] = Document(
+            filename=doc_path.name,
+            content="",
+            is_duplicate=False,
+            embedding_generated=False
+        )
+
     def _generate_embeddings_parallel(self, txt_files: list[Path]) -> None:
         """Generate embeddings in parallel using multiple workers."""
         self.status_updated.emit("Starting parallel embedding generation...")
         
-        # Create parallel processor
-        parallel_processor = ParallelEmbeddingProcessor()
+        # Get the parallel processor; its workers persist between runs
+        parallel_processor = _shared_embedding_processor()
         
         # Emit worker count
         self.embedding_worker_count.emit(parallel_processor.num_workers)
@@ -326,6 +442,13 @@ class ProcessingWorker(QThread):
             rate = parallel_processor.get_processing_rate()
             if rate > 0:
                 self.embedding_rate_updated.emit(rate)
+
+            # Duplicate counts go out with progress, which the processor
+            # throttles, rather than once per duplicate
+            if self.stats.get("duplicates") != duplicate_count:
+                self.stats["duplicates"] = duplicate_count
+                self.stats_updated.emit(self.stats.copy())
+                self.duplicates_found.emit(duplicate_count)
         
         def handle_error(error: str) -> None:
             """Handle embedding errors."""
@@ -336,11 +459,6 @@ class ProcessingWorker(QThread):
             nonlocal duplicate_count
             if document.is_duplicate:
                 duplicate_count += 1
-                # Update stats and emit in real-time
-                self.stats["duplicates"] = duplicate_count
-                self.stats_updated.emit(self.stats.copy())
-                # Also emit specific duplicate count
-                self.duplicates_found.emit(duplicate_count)
         
         parallel_processor.set_progress_callback(update_progress)
         parallel_processor.set_error_callback(handle_error)
@@ -353,23 +471,19 @@ class ProcessingWorker(QThread):
         
         # Log embedding events to audit trail (since parallel processor doesn't have audit support yet)
         if self.audit_manager and self.request_id:
-            logger.info(f"🔍 WORKER: Adding audit entries for {len(self._document_metadata)} embedding results")
-            for doc_path, document in self._document_metadata.items():
-                self.audit_manager.log_embedding(
-                    filename=doc_path.name,
-                    request_id=self.request_id,
-                    success=document.embedding_generated if document.embedding_generated is not None else True
-                )
-                
-                # Also log duplicate detection results
-                self.audit_manager.log_duplicate(
-                    filename=doc_path.name,
-                    request_id=self.request_id,
-                    is_duplicate=document.is_duplicate,
-                    duplicate_of=document.duplicate_of,
-                    similarity_score=document.similarity_score
-                )
-        
+            documents = [
+                (doc_path.name, document) for doc_path, document in self._document_metadata.items()
+            ]
+            self.audit_manager.log_embeddings(self.request_id, [
+                (filename, document.embedding_generated is not False)
+                for filename, document in documents
+            ])
+            self.audit_manager.log_duplicates(self.request_id, [
+                (filename, document.is_duplicate, document.duplicate_of,
+                 document.similarity_score)
+                for filename, document in documents
+            ])
+
         # Emit final counts
         self.duplicates_found.emit(duplicate_count)
         self.stats["duplicates"] = duplicate_count
@@ -435,8 +549,8 @@ class ProcessingWorker(QThread):
 
     def _process_parallel(self, txt_files: list[Path]) -> None:
         """Process documents in parallel using multiple workers."""
-        # Create parallel processor (workflow created in each worker)
-        self._parallel_processor = ParallelDocumentProcessor()
+        # Get the parallel processor (workflow created once in each worker)
+        self._parallel_processor = _shared_document_processor()
 
         # Reset duplicate count for reprocessing
         if self.feedback_examples:
@@ -486,16 +600,14 @@ class ProcessingWorker(QThread):
             else:
                 self.stats["uncertain"] += 1
 
-            # Emit document and updated stats
+            # Stats are emitted with the next progress update
             self.document_processed.emit(document)
-            self.stats_updated.emit(self.stats.copy())
 
         def handle_audit_events(audit_events) -> None:
             """Handle audit events from parallel processing."""
-            logger.info(f"🔍 WORKER: handle_audit_events called with {len(audit_events)} events")
+            logger.debug("Handling %d audit events", len(audit_events))
             if self.audit_manager:
                 for event in audit_events:
-                    logger.info(f"🔍 WORKER: Processing audit event {event.event_type} for {event.filename}")
                     if event.event_type == "classification":
                         self.audit_manager.log_classification(
                             filename=event.filename,
@@ -503,16 +615,21 @@ class ProcessingWorker(QThread):
                             confidence=event.details["confidence"],
                             request_id=event.request_id
                         )
-                        logger.info(f"🔍 WORKER: Logged classification to audit manager")
+                    elif event.event_type == "rule_classification":
+                        self.audit_manager.log_rule_classification(
+                            filename=event.filename,
+                            result=event.details["result"],
+                            rule=event.details["rule"],
+                            request_id=event.request_id
+                        )
                     elif event.event_type == "error":
                         self.audit_manager.log_error(
                             filename=event.filename,
                             error_message=event.details["error_message"],
                             request_id=event.request_id
                         )
-                        logger.info(f"🔍 WORKER: Logged error to audit manager")
             else:
-                logger.warning(f"🔍 WORKER: No audit_manager available!")
+                logger.warning("No audit_manager available")
 
         self._parallel_processor.set_progress_callback(update_progress)
         self._parallel_processor.set_error_callback(handle_error)
@@ -521,7 +638,8 @@ class ProcessingWorker(QThread):
 
         # Process documents with feedback examples and embedding metadata
         self._parallel_processor.process_documents(
-            txt_files, self.foia_request, self.feedback_examples, embedding_metadata, self.request_id
+            txt_files, self.foia_request, self.feedback_examples, embedding_metadata, self.request_id,
+            self.feedback_rules
         )
 
         # Documents are already emitted via callback as they complete
@@ -545,7 +663,7 @@ class ProcessingWorker(QThread):
             content = doc_metadata.content
         else:
             # Read file content if not already loaded
-            content = file_path.read_text(encoding="utf-8")
+            content = read_text(file_path)
             doc_metadata = None
 
         # Import the state creation function from workflow
@@ -555,6 +673,7 @@ class ProcessingWorker(QThread):
         initial_state = create_initial_state(file_path.name, self.foia_request)
         initial_state["content"] = content  # Add the content we already read
         initial_state["feedback_examples"] = self.feedback_examples  # Add feedback examples
+        initial_state["feedback_rules"] = self.feedback_rules
         initial_state["audit_manager"] = self.audit_manager  # Add audit manager for logging
         initial_state["request_id"] = self.request_id  # Add request ID for audit logging
         
@@ -573,9 +692,9 @@ class ProcessingWorker(QThread):
         document = Document(
             filename=final_state["filename"],
             content=final_state["content"],
-            classification=final_state["classification"],
-            confidence=final_state["confidence"],
-            justification=final_state["justification"],
+            classification=final_state.get("classification"),
+            confidence=final_state.get("confidence"),
+            justification=final_state.get("justification"),
             exemptions=final_state.get("exemptions", []),
         )
 
@@ -0,0 +1,170 @@
+"""Long-lived worker processes shared by the parallel processors."""
+
+import multiprocessing as mp
+import sys
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from multiprocessing.connection import wait
+from queue import Empty
+from typing import Any
+
+# Fork on Linux so workers inherit already-imported modules and objects built
+# in the parent, such as the compiled workflow. Other platforms keep their
+# default because forking a GUI process is unsafe there.
+_CONTEXT = mp.get_context("fork") if sys.platform.startswith("linux") else mp.get_context()
+
+# Put on the result queue by watch_exits when a worker process exits
+WORKER_EXITED = "__worker_exited__"
+
+
+class WorkerPool:
+    """Worker processes that read batches from a shared task queue.
+
+    Workers are started on first use and stay alive between calls, so later
+    runs skip process start-up and per-process setup such as compiling the
+    workflow. A ``None`` on the task queue tells one worker to exit.
+    """
+
+    def __init__(
+        self,
+        target: Callable[..., None],
+        num_workers: int,
+        leading_args: tuple[Any, ...] = (),
+    ) -> None:
+        """Initialize the pool without starting any processes.
+
+        Args:
+            target: Worker function, called as ``target(*leading_args, task_queue, result_queue)``
+            num_workers: Number of worker processes
+            leading_args: Arguments passed before the queues
+
+        """
+        self.target = target
+        self.num_workers = num_workers
+        self.leading_args = leading_args
+        self.workers: list[mp.Process] = []
+        self.task_queue: Any = None
+        self.result_queue: Any = None
+
+    def start(self) -> None:
+        """Start the workers unless they are all still running."""
+        if self.workers and all(worker.is_alive() for worker in self.workers):
+            return
+        self.stop()
+
+        self.task_queue = _CONTEXT.Queue()
+        self.result_queue = _CONTEXT.Queue()
+        for _ in range(self.num_workers):
+            # Daemonic so idle workers never keep the application from exiting
+            worker = _CONTEXT.Process(
+                target=self.target,
+                args=(*self.leading_args, self.task_queue, self.result_queue),
+                daemon=True,
+            )
+            worker.start()
+            self.workers.append(worker)
+
+    def request_stop(self) -> None:
+        """Ask workers to exit once the batches already queued are done."""
+        for _ in self.workers:
+            self.task_queue.put(None)
+
+    @contextmanager
+    def watch_exits(self) -> Iterator[None]:
+        """Post ``WORKER_EXITED`` on the result queue as each worker exits.
+
+        A watcher thread blocks on the workers' sentinels, so callers can block
+        on the result queue without a timeout and still notice dead workers.
+        A worker's results are flushed before it exits, so its notice always
+        arrives after them.
+
+        If the caller's block raises, results from the abandoned run may still
+        be queued or in progress, so the workers are terminated and the next
+        ``start`` creates fresh queues rather than handing them to a new run.
+        """
+        wake_reader, wake_writer = mp.Pipe(duplex=False)
+
+        def watch() -> None:
+            running = {worker.sentinel: worker for worker in self.workers}
+            while running:
+                ready = wait([wake_reader, *running])
+                if wake_reader in ready:
+                    return
+                for sentinel in ready:
+                    # The sentinel can fire before the process is reaped;
+                    # join so its exit code is set before the notice arrives
+                    running.pop(sentinel).join()
+                    self.result_queue.put(WORKER_EXITED)
+
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+        abandoned = False
+        try:
+            yield
+        except BaseException:
+            abandoned = True
+            raise
+        finally:
+            wake_writer.send(None)
+            watcher.join()
+            wake_reader.close()
+            wake_writer.close()
+            if abandoned:
+                self.stop(timeout=0)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers and wait for them to exit.
+
+        Args:
+            timeout: Seconds to wait for each worker before terminating it;
+                0 terminates workers that are still busy straight away
+
+        """
+        if not self.workers:
+            return
+        self.request_stop()
+        for worker in self.workers:
+            worker.join(timeout=timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self.workers = []
+
+
+def drain(result_queue: Any, max_items: int, timeout: float | None = None) -> list[Any]:
+    """Wait for one result, then take any others already queued.
+
+    Args:
+        result_queue: Queue to read results from
+        max_items: Maximum number of results to return
+        timeout: Seconds to wait for the first result; None waits indefinitely
+
+    Returns:
+        Between 1 and ``max_items`` results
+
+    Raises:
+        Empty: If no result arrives within ``timeout``
+
+    """
+    window = [result_queue.get(timeout=timeout)]
+    while len(window) < max_items:
+        try:
+            window.append(result_queue.get_nowait())
+        except Empty:
+            break
+    return window
+
+
+def split_exits(window: list[Any]) -> tuple[list[Any], int]:
+    """Separate worker exit notices from results.
+
+    Args:
+        window: Items taken from a result queue
+
+    Returns:
+        The results, and the number of ``WORKER_EXITED`` notices removed
+
+    """
+    results = [item for item in window if item != WORKER_EXITED]
+    return results, len(window) - len(results)
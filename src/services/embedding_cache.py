@@ -0,0 +1,167 @@
+"""Persistent cache for document embeddings keyed by content hash.
+"""
+import logging
+import sqlite3
+import time
+from contextlib import suppress
+from pathlib import Path
+
+import numpy as np
+
+from ..config import EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_TTL_SECONDS
+from .embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_CHUNK_SIZE = 500
+
+
+class CachedEmbeddingClient:
+    """Embedding client that reuses embeddings stored on disk.
+
+    Embeddings are stored per (provider, model, content hash), so re-processing
+    a folder only calls the embeddings API for documents not seen before.
+    """
+
+    provider = "openai"
+
+    def __init__(self, embedding_service: EmbeddingService,
+                 db_path: Path | None = None,
+                 ttl_seconds: float | None = EMBEDDING_CACHE_TTL_SECONDS) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            embedding_service: Service used to compute embeddings on cache misses
+            db_path: Location of the SQLite cache file
+            ttl_seconds: Maximum age of a cached embedding; None keeps entries forever
+
+        """
+        self.embedding_service = embedding_service
+        self.ttl_seconds = ttl_seconds
+        self._conn: sqlite3.Connection | None = None
+
+        db_path = db_path or EMBEDDING_CACHE_PATH
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, timeout=30)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "provider TEXT NOT NULL, model TEXT NOT NULL, hash TEXT NOT NULL, "
+                "vec BLOB NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (provider, model, hash))"
+            )
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Embedding cache unavailable, computing directly: {e!s}")
+            self._conn = None
+
+    def get_or_compute(self, texts: list[str],
+                       hashes: list[str] | None = None) -> list[list[float] | None]:
+        """Get embeddings for texts, computing and storing only cache misses.
+
+        Args:
+            texts: The document contents to embed
+            hashes: Content hashes of ``texts`` if the caller already has them
+
+        Returns:
+            Embeddings aligned with ``texts``; None where generation failed
+
+        """
+        if self._conn is None:
+            return self.embedding_service.generate_embeddings(texts)
+
+        if hashes is None:
+            hashes = [self.embedding_service.generate_content_hash(t) for t in texts]
+        try:
+            cached = self._get(set(hashes))
+        except sqlite3.Error as e:
+            # e.g. another worker process holds the lock; the cache is optional
+            logger.warning("Embedding cache lookup failed, computing directly: %s", e)
+            self._rollback()
+            return self.embedding_service.generate_embeddings(texts)
+
+        misses: dict[str, str] = {}
+        for content_hash, text in zip(hashes, texts, strict=True):
+            if content_hash not in cached:
+                misses.setdefault(content_hash, text)
+
+        if misses:
+            computed = self.embedding_service.generate_embeddings(list(misses.values()))
+            new_entries = {
+                content_hash: embedding
+                for content_hash, embedding in zip(misses, computed, strict=True)
+                if embedding is not None
+            }
+            try:
+                self._put(new_entries)
+            except sqlite3.Error as e:
+                logger.warning("Embedding cache write failed, not caching: %s", e)
+                self._rollback()
+            cached.update(new_entries)
+
+        logger.debug(
+            "Embedding cache: %d hits, %d misses", len(texts) - len(misses), len(misses)
+        )
+        return [cached.get(content_hash) for content_hash in hashes]
+
+    def _get(self, hashes: set[str]) -> dict[str, list[float]]:
+        """Look up cached embeddings, evicting entries past their TTL."""
+        assert self._conn is not None
+        found: dict[str, list[float]] = {}
+        expired: list[str] = []
+        cutoff = time.time() - self.ttl_seconds if self.ttl_seconds else None
+        model = self.embedding_service.model
+
+        hash_list = list(hashes)
+        for start in range(0, len(hash_list), _QUERY_CHUNK_SIZE):
+            chunk = hash_list[start:start + _QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                "SELECT hash, vec, created_at FROM embeddings "
+                f"WHERE provider = ? AND model = ? AND hash IN ({placeholders})",
+                (self.provider, model, *chunk),
+            )
+            for content_hash, vec, created_at in rows:
+                if cutoff is not None and created_at < cutoff:
+                    expired.append(content_hash)
+                else:
+                    found[content_hash] = np.frombuffer(vec, dtype=np.float32).tolist()
+
+        if expired:
+            self._conn.executemany(
+                "DELETE FROM embeddings WHERE provider = ? AND model = ? AND hash = ?",
+                [(self.provider, model, content_hash) for content_hash in expired],
+            )
+            self._conn.commit()
+
+        return found
+
+    def _put(self, embeddings: dict[str, list[float]]) -> None:
+        """Store newly computed embeddings."""
+        assert self._conn is not None
+        if not embeddings:
+            return
+        now = time.time()
+        model = self.embedding_service.model
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)",
+            [
+                (self.provider, model, content_hash,
+                 np.asarray(embedding, dtype=np.float32).tobytes(), now)
+                for content_hash, embedding in embeddings.items()
+            ],
+        )
+        self._conn.commit()
+
+    def _rollback(self) -> None:
+        """Discard a transaction left open by a failed statement."""
+        assert self._conn is not None
+        with suppress(sqlite3.Error):
+            self._conn.rollback()
+
+    def close(self) -> None:
+        """Close the cache database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -21,6 +21,8 @@ class EmbeddingService:
         self.client = OpenAI(api_key=api_key)
         self.model = "text-embedding-3-small"
         self.max_chars = 8000  # ~2000 tokens
+        self.max_batch_size = 100  # Inputs per embeddings API request
+        self.max_batch_chars = 400_000  # ~100k tokens per embeddings API request
 
     def generate_embedding(self, content: str) -> list[float] | None:
         """Generate embedding for document content.
@@ -45,6 +47,111 @@ class EmbeddingService:
             logger.error(f"Embedding generation error: {e!s}")
             return None
 
+    def generate_embeddings(self, contents: list[str]) -> list[list[float] | None]:
+        """Generate embeddings for many documents with as few API calls as possible.
+
+        Identical inputs are embedded once, and unique inputs are sent in
+        requests of up to ``max_batch_size`` items and ``max_batch_chars``
+        characters. A failed request is retried once as two halves.
+
+        Args:
+            contents: The document contents to generate embeddings for
+
+        Returns:
+            Embeddings aligned with ``contents``; None where generation failed
+
+        """
+        # Deduplicate by hash of the text actually sent to the API
+        unique: dict[str, str] = {}
+        keys = []
+        for content in contents:
+            truncated_content = content[:self.max_chars]
+            key = self.generate_content_hash(truncated_content)
+            unique.setdefault(key, truncated_content)
+            keys.append(key)
+
+        embeddings: dict[str, list[float] | None] = {}
+        for batch_keys in self._pack_batches(unique):
+            texts = [unique[key] for key in batch_keys]
+            try:
+                results = self._embed_batch(texts)
+            except Exception as e:
+                if len(texts) == 1:
+                    logger.error(f"Batch embedding generation error: {e!s}")
+                    results = [None]
+                else:
+                    # Oversized or throttled requests often succeed when split
+                    logger.warning(
+                        "Embedding batch of %d failed (%s); retrying in halves",
+                        len(texts), e,
+                    )
+                    results = self._embed_halves(texts)
+            embeddings.update(zip(batch_keys, results, strict=True))
+
+        return [embeddings.get(key) for key in keys]
+
+    def _pack_batches(self, unique: dict[str, str]) -> list[list[str]]:
+        """Group keys into requests bounded by item count and total characters.
+
+        Args:
+            unique: Truncated contents keyed by hash
+
+        Returns:
+            Lists of keys, one per API request
+
+        """
+        batches: list[list[str]] = []
+        current: list[str] = []
+        chars = 0
+        for key, text in unique.items():
+            if current and (
+                len(current) >= self.max_batch_size
+                or chars + len(text) > self.max_batch_chars
+            ):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(key)
+            chars += len(text)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float] | None]:
+        """Embed texts in a single API request.
+
+        Args:
+            texts: Truncated contents to embed
+
+        Returns:
+            Embeddings aligned with ``texts``
+
+        """
+        response = self.client.embeddings.create(model=self.model, input=texts)
+        results: list[list[float] | None] = [None] * len(texts)
+        for item in response.data:
+            results[item.index] = item.embedding
+        return results
+
+    def _embed_halves(self, texts: list[str]) -> list[list[float] | None]:
+        """Retry a failed request once as two half-size requests.
+
+        Args:
+            texts: Truncated contents from the failed request
+
+        Returns:
+            Embeddings aligned with ``texts``; None for halves that fail again
+
+        """
+        middle = len(texts) // 2
+        results: list[list[float] | None] = []
+        for half in (texts[:middle], texts[middle:]):
+            try:
+                results.extend(self._embed_batch(half))
+            except Exception as e:
+                logger.error(f"Batch embedding generation error: {e!s}")
+                results.extend([None] * len(half))
+        return results
+
     def generate_content_hash(self, content: str) -> str:
         """Generate SHA-256 hash of content for exact duplicate detection.
         
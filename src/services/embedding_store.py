@@ -9,21 +9,28 @@ class EmbeddingStore:
 
     def __init__(self) -> None:
         """Initialize empty embedding store with request isolation."""
-        # Store embeddings by request_id -> filename -> embedding
-        self._embeddings: dict[str, dict[str, list[float]]] = {}
+        # Store embeddings as float32 arrays by request_id -> filename -> embedding
+        self._embeddings: dict[str, dict[str, np.ndarray]] = {}
         # Store content hashes by request_id -> filename -> hash
         self._hashes: dict[str, dict[str, str]] = {}
         # Track processing order by request_id -> list of filenames
         self._processed_order: dict[str, list[str]] = {}
+        # Unit-normalized float32 embeddings by request_id, one row per filename.
+        # Arrays grow by doubling; only the first len(_row_names) rows are used.
+        self._matrices: dict[str, np.ndarray] = {}
+        self._row_names: dict[str, list[str]] = {}
+        self._rows: dict[str, dict[str, int]] = {}
+        # First filename stored for each content hash, by request_id
+        self._by_hash: dict[str, dict[str, str]] = {}
 
     def add_embedding(self, request_id: str, filename: str,
-                     embedding: list[float], content_hash: str) -> None:
+                     embedding: list[float] | np.ndarray, content_hash: str) -> None:
         """Store an embedding for a document.
         
         Args:
             request_id: The FOIA request ID
             filename: The document filename
-            embedding: The embedding vector
+            embedding: The embedding vector; stored as float32
             content_hash: The SHA-256 hash of the document content
 
         """
@@ -34,9 +41,55 @@ class EmbeddingStore:
             self._processed_order[request_id] = []
 
         # Store the embedding and hash
+        embedding = np.asarray(embedding, dtype=np.float32)
         self._embeddings[request_id][filename] = embedding
+        previous_hash = self._hashes[request_id].get(filename)
         self._hashes[request_id][filename] = content_hash
+        if previous_hash is None:
+            self._by_hash.setdefault(request_id, {}).setdefault(content_hash, filename)
+        elif previous_hash != content_hash:
+            # A re-added document changed content; rebuild so lookups still
+            # return the first filename in storage order
+            self._index_hashes(request_id)
         self._processed_order[request_id].append(filename)
+        self._index_embedding(request_id, filename, embedding)
+
+    def _index_embedding(self, request_id: str, filename: str,
+                         embedding: list[float] | np.ndarray) -> None:
+        """Add or replace a document's row in the request's similarity matrix."""
+        vector = self._normalize(embedding)
+        rows = self._rows.setdefault(request_id, {})
+        names = self._row_names.setdefault(request_id, [])
+        matrix = self._matrices.get(request_id)
+
+        if filename in rows:
+            matrix[rows[filename]] = vector
+            return
+
+        if matrix is None:
+            matrix = np.empty((16, vector.shape[0]), dtype=np.float32)
+        elif len(names) == matrix.shape[0]:
+            matrix = np.concatenate([matrix, np.empty_like(matrix)])
+        self._matrices[request_id] = matrix
+
+        rows[filename] = len(names)
+        matrix[len(names)] = vector
+        names.append(filename)
+
+    def _index_hashes(self, request_id: str) -> None:
+        """Rebuild the hash lookup for a request from its stored hashes."""
+        by_hash: dict[str, str] = {}
+        for filename, content_hash in self._hashes.get(request_id, {}).items():
+            by_hash.setdefault(content_hash, filename)
+        self._by_hash[request_id] = by_hash
+
+    @staticmethod
+    def _normalize(embedding: list[float] | np.ndarray) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        # Zero vectors stay zero and so have similarity 0 with everything
+        return vector / norm if norm else vector
 
     def find_exact(self, request_id: str, content_hash: str) -> str | None:
         """Find exact duplicate by content hash.
@@ -49,13 +102,7 @@ class EmbeddingStore:
             Filename of the first matching document, or None if no match
 
         """
-        request_hashes = self._hashes.get(request_id, {})
-
-        for filename, stored_hash in request_hashes.items():
-            if stored_hash == content_hash:
-                return filename
-
-        return None
+        return self._by_hash.get(request_id, {}).get(content_hash)
 
     def find_similar(self, request_id: str, embedding: list[float],
                     threshold: float = 0.85) -> list[tuple[str, float]]:
@@ -70,45 +117,35 @@ class EmbeddingStore:
             List of (filename, similarity_score) tuples sorted by similarity
 
         """
-        similar_docs = []
-        request_embeddings = self._embeddings.get(request_id, {})
+        return self.find_similar_batch(request_id, [embedding], threshold)[0]
 
-        for filename, stored_embedding in request_embeddings.items():
-            similarity = self._cosine_similarity(embedding, stored_embedding)
-            if similarity >= threshold:
-                similar_docs.append((filename, similarity))
+    def find_similar_batch(self, request_id: str, embeddings: list[list[float]],
+                           threshold: float = 0.85) -> list[list[tuple[str, float]]]:
+        """Find similar documents for several embeddings with one matrix product.
 
-        # Sort by similarity score (highest first)
-        return sorted(similar_docs, key=lambda x: x[1], reverse=True)
-
-    def _cosine_similarity(self, vec1: list[float], vec2: list[float]) -> float:
-        """Calculate cosine similarity between two vectors.
-        
         Args:
-            vec1: First embedding vector
-            vec2: Second embedding vector
-            
+            request_id: The FOIA request ID
+            embeddings: The embedding vectors to compare against
+            threshold: Minimum similarity score (0-1) to be considered similar
+
         Returns:
-            Cosine similarity score between 0 and 1
+            One list of (filename, similarity_score) tuples per embedding,
+            each sorted as in :meth:`find_similar`
 
         """
-        # Convert to numpy arrays
-        vec1_array = np.array(vec1)
-        vec2_array = np.array(vec2)
-
-        # Calculate dot product
-        dot_product = np.dot(vec1_array, vec2_array)
-
-        # Calculate norms
-        norm1 = np.linalg.norm(vec1_array)
-        norm2 = np.linalg.norm(vec2_array)
-
-        # Handle zero vectors
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        # Calculate cosine similarity
-        return float(dot_product / (norm1 * norm2))
+        names = self._row_names.get(request_id)
+        if not names or not embeddings:
+            return [[] for _ in embeddings]
+
+        matrix = self._matrices[request_id][:len(names)]
+        queries = np.stack([self._normalize(embedding) for embedding in embeddings])
+        results = []
+        for similarities in queries @ matrix.T:
+            matches = np.flatnonzero(similarities >= threshold)
+            # Sort by similarity score (highest first), keeping insertion order on ties
+            order = matches[np.argsort(-similarities[matches], kind="stable")]
+            results.append([(names[i], float(similarities[i])) for i in order])
+        return results
 
     def clear_request(self, request_id: str) -> None:
         """Clear all embeddings for a specific request.
@@ -120,6 +157,10 @@ class EmbeddingStore:
         self._embeddings.pop(request_id, None)
         self._hashes.pop(request_id, None)
         self._processed_order.pop(request_id, None)
+        self._matrices.pop(request_id, None)
+        self._row_names.pop(request_id, None)
+        self._rows.pop(request_id, None)
+        self._by_hash.pop(request_id, None)
 
     def get_processed_count(self, request_id: str) -> int:
         """Get the number of processed documents for a request.
@@ -140,7 +181,13 @@ class EmbeddingStore:
             Dictionary representation of the store
         """
         return {
-            "embeddings": self._embeddings,
+            "embeddings": {
+                request_id: {
+                    filename: embedding.tolist()
+                    for filename, embedding in embeddings.items()
+                }
+                for request_id, embeddings in self._embeddings.items()
+            },
             "hashes": self._hashes,
             "processed_order": self._processed_order
         }
@@ -156,7 +203,18 @@ class EmbeddingStore:
             New EmbeddingStore instance
         """
         store = cls()
-        store._embeddings = data.get("embeddings", {})
+        store._embeddings = {
+            request_id: {
+                filename: np.asarray(embedding, dtype=np.float32)
+                for filename, embedding in embeddings.items()
+            }
+            for request_id, embeddings in data.get("embeddings", {}).items()
+        }
         store._hashes = data.get("hashes", {})
         store._processed_order = data.get("processed_order", {})
+        for request_id in store._hashes:
+            store._index_hashes(request_id)
+        for request_id, embeddings in store._embeddings.items():
+            for filename, embedding in embeddings.items():
+                store._index_embedding(request_id, filename, embedding)
         return store
@@ -0,0 +1,158 @@
+"""MinHash signatures with LSH banding for cheap near-duplicate detection.
+"""
+import re
+import zlib
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHIFT_32 = np.uint64(32)
+_SHIFT_61 = np.uint64(61)
+# Shingle hashes permuted per chunk, keeping temporaries cache-sized
+_CHUNK_SIZE = 1024
+# Highest score reported for a MinHash match. Shingles ignore case and
+# punctuation, so different files can estimate 1.0; scores of 0.99 and up
+# are reported as exact duplicates, which only the content hash can establish.
+MAX_NEAR_DUPLICATE_SCORE = 0.98
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class NearDuplicateIndex:
+    """In-memory MinHash LSH index over word shingles.
+
+    Documents whose estimated Jaccard similarity meets the threshold are
+    reported as near duplicates without needing an embedding.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128,
+                 bands: int = 16, shingle_size: int = 5, seed: int = 1) -> None:
+        """Initialize an empty index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity for a match
+            num_perm: Number of hash permutations per signature
+            bands: Number of LSH bands; must divide ``num_perm``
+            shingle_size: Number of words per shingle
+            seed: Seed for the permutation parameters
+
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self._rows = num_perm // bands
+        self._bands = bands
+
+        rng = np.random.default_rng(seed)
+        # Parameters stay below 2**32 so (a * x + b) cannot overflow uint64
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        # Odd multipliers that combine the word hashes at each shingle position
+        self._mix = rng.integers(0, 1 << 63, size=shingle_size, dtype=np.uint64) | np.uint64(1)
+
+        self._signatures: dict[str, np.ndarray] = {}
+        self._buckets: list[dict[bytes, list[str]]] = [{} for _ in range(bands)]
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """Compute the MinHash signature of a text.
+
+        Args:
+            text: The document content
+
+        Returns:
+            Signature array, or None if the text has no words
+
+        """
+        words = _WORD_PATTERN.findall(text.lower())
+        if not words:
+            return None
+
+        # Hash each word once, then combine each window of word hashes into a
+        # shingle hash (multiply-shift) instead of joining and hashing strings
+        word_hashes = np.fromiter(
+            (zlib.crc32(word.encode("utf-8")) for word in words),
+            dtype=np.uint64,
+            count=len(words),
+        )
+        size = min(self.shingle_size, len(words))
+        count = len(words) - size + 1
+        combined = word_hashes[:count] * self._mix[0]
+        for position in range(1, size):
+            combined += word_hashes[position:position + count] * self._mix[position]
+        hashes = np.unique(combined >> _SHIFT_32)
+
+        signature = np.full(len(self._a), _MAX_HASH, dtype=np.uint64)
+        for start in range(0, len(hashes), _CHUNK_SIZE):
+            permuted = np.multiply.outer(hashes[start:start + _CHUNK_SIZE], self._a)
+            permuted += self._b
+            # x mod (2**61 - 1) as (low 61 bits + high bits), avoiding division
+            reduced = permuted & _MERSENNE_PRIME
+            reduced += permuted >> _SHIFT_61
+            reduced[reduced >= _MERSENNE_PRIME] -= _MERSENNE_PRIME
+            reduced &= _MAX_HASH
+            np.minimum(signature, reduced.min(axis=0), out=signature)
+        return signature
+
+    def query(self, signature: np.ndarray) -> tuple[str, float] | None:
+        """Find the most similar indexed document above the threshold.
+
+        Args:
+            signature: Signature from :meth:`signature`
+
+        Returns:
+            Tuple of (key, estimated Jaccard similarity capped at
+            ``MAX_NEAR_DUPLICATE_SCORE``), or None if no match
+
+        """
+        candidates: set[str] = set()
+        for band, bucket in zip(self._band_keys(signature), self._buckets, strict=True):
+            candidates.update(bucket.get(band, ()))
+
+        best: tuple[str, float] | None = None
+        for key in candidates:
+            similarity = float(np.mean(self._signatures[key] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        if best is None:
+            return None
+        return best[0], min(best[1], MAX_NEAR_DUPLICATE_SCORE)
+
+    def insert(self, key: str, signature: np.ndarray) -> None:
+        """Add a document signature to the index.
+
+        Args:
+            key: Identifier returned by later matches (e.g. the filename)
+            signature: Signature from :meth:`signature`
+
+        """
+        self._signatures[key] = signature
+        for band, bucket in zip(self._band_keys(signature), self._buckets, strict=True):
+            bucket.setdefault(band, []).append(key)
+
+    def find_or_insert(self, key: str, text: str) -> tuple[str, float] | None:
+        """Return the near duplicate of a text, indexing it if there is none.
+
+        Args:
+            key: Identifier for the text
+            text: The document content
+
+        Returns:
+            Tuple of (matching key, estimated Jaccard similarity), or None
+
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        match = self.query(signature)
+        if match is None:
+            self.insert(key, signature)
+        return match
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        """Split a signature into hashable LSH band keys."""
+        return [
+            signature[i * self._rows:(i + 1) * self._rows].tobytes()
+            for i in range(self._bands)
+        ]
@@ -0,0 +1,20 @@
+"""Filename helpers shared by the classification workflow."""
+
+from pathlib import PurePath
+
+
+def get_filename_prefix(filename: str) -> str:
+    """Extract the document type prefix from a filename.
+
+    Uses the text before the first underscore (e.g. ``email`` for
+    ``email_budget.txt``), or the stem when the name has no underscore.
+
+    Args:
+        filename: Document filename or path
+
+    Returns:
+        The filename prefix
+
+    """
+    name = PurePath(filename).name
+    return name.split("_")[0] if "_" in name else name.split(".")[0]
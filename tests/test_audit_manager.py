@@ -0,0 +1,114 @@
+"""
+Unit tests for the AuditManager class.
+"""
+
+import pytest
+from src.models.audit import EventType
+from src.processing.audit_manager import AuditManager
+
+
+class TestAuditManager:
+    """Test cases for AuditManager"""
+
+    @pytest.fixture
+    def manager(self):
+        """Create an AuditManager with entries across two requests"""
+        manager = AuditManager()
+        manager.log_classification("a.txt", "responsive", 0.9, "req1")
+        manager.log_classification("b.txt", "non_responsive", 0.8, "req2")
+        manager.log_review("a.txt", "responsive", "responsive", "req1")
+        manager.log_export("CSV", 1, "req1")
+        manager.log_classification("a.txt", "uncertain", 0.5, "req2")
+        return manager
+
+    def test_get_entries_unfiltered(self, manager):
+        """Test that all entries are returned in logging order"""
+        entries = manager.get_entries()
+        assert len(entries) == 5
+        assert entries[0].event_type == EventType.CLASSIFY
+
+    def test_filter_by_request(self, manager):
+        """Test filtering by request ID"""
+        entries = manager.get_entries(request_id="req1")
+        assert [e.event_type for e in entries] == [
+            EventType.CLASSIFY, EventType.REVIEW, EventType.EXPORT
+        ]
+
+    def test_filter_by_documents(self, manager):
+        """Test filtering by document keeps logging order across documents"""
+        entries = manager.get_entries(document_filter=["b.txt", "a.txt"])
+        assert [(e.document_filename, e.request_id) for e in entries] == [
+            ("a.txt", "req1"), ("b.txt", "req2"), ("a.txt", "req1"), ("a.txt", "req2")
+        ]
+
+    def test_filter_by_request_and_document(self, manager):
+        """Test combining request and document filters"""
+        entries = manager.get_entries(request_id="req2", document_filter=["a.txt"])
+        assert len(entries) == 1
+        assert entries[0].ai_result == "uncertain"
+
+    def test_filter_with_no_matches(self, manager):
+        """Test filters that match nothing"""
+        assert manager.get_entries(request_id="missing") == []
+        assert manager.get_entries(document_filter=["missing.txt"]) == []
+
+    def test_get_all_documents(self, manager):
+        """Test that document-request pairs are unique and sorted"""
+        assert manager.get_all_documents() == [
+            ("a.txt", "req1"), ("a.txt", "req2"), ("b.txt", "req2")
+        ]
+
+    def test_event_details(self, manager):
+        """Test the details text recorded for each event type"""
+        details = [entry.details for entry in manager.get_entries()]
+        assert details[0] == "AI Classification - Confidence: 0.90"
+        assert details[2] == "User Review - Approved"
+        assert details[3] == "Export CSV - 1 documents"
+
+        manager.log_review("b.txt", "non_responsive", "responsive", "req2")
+        manager.log_view("b.txt", "Review", "req2")
+        manager.log_error(None, "boom", "req2")
+        manager.log_export("JSON", 5, "req2", ["a", "b", "c", "d", "e"])
+        assert [entry.details for entry in manager.get_entries()[-4:]] == [
+            "User Review - Override",
+            "Document viewed in Review",
+            "Error: boom",
+            "Export JSON - 5 documents (Selected: a, b, c and 2 more)",
+        ]
+
+    def test_bulk_embedding_and_duplicate_entries(self):
+        """Test that bulk logging matches the per-document details"""
+        manager = AuditManager()
+        manager.log_embeddings("req1", [("a.txt", True), ("b.txt", False)])
+        manager.log_duplicates("req1", [
+            ("a.txt", False, None, None),
+            ("b.txt", True, "a.txt", 1.0),
+            ("c.txt", True, "a.txt", 0.9),
+        ])
+
+        assert [entry.details for entry in manager.get_entries()] == [
+            "Embedding generated successfully",
+            "Embedding generation failed: Unknown error",
+            "Marked as original document (no duplicates found)",
+            "Marked as exact duplicate of a.txt",
+            "Marked as duplicate of a.txt (90.0% similar)",
+        ]
+        assert [entry.document_filename for entry in manager.get_entries(
+            document_filter=["b.txt"]
+        )] == ["b.txt", "b.txt"]
+
+    def test_rule_classification_is_not_recorded_as_ai(self):
+        """Test that rule-based classifications say which rule applied"""
+        manager = AuditManager()
+        manager.log_rule_classification(
+            "email_a.txt", "non_responsive",
+            "'email' filename rule, 3 of 3 corrections agreed", "req1"
+        )
+
+        entry = manager.get_entries()[0]
+        assert entry.event_type == EventType.CLASSIFY
+        assert entry.ai_result == "non_responsive"
+        assert entry.details == (
+            "Rule-based Classification (no AI) - "
+            "'email' filename rule, 3 of 3 corrections agreed"
+        )
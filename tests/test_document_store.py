@@ -256,4 +256,61 @@ class TestDocumentStore:
         assert store.has_documents("request1") is True
         
         store.clear_request("request1")
-        assert store.has_documents("request1") is False
\ No newline at end of file
+        assert store.has_documents("request1") is False
+
+    def test_queries_keep_store_order(self, store, sample_documents):
+        """Test that filtered results come back in insertion order"""
+        store.add_documents("request1", sample_documents)
+        store.update_document("request1", "doc1.txt", human_decision="responsive")
+        store.update_document("request1", "doc1.txt", human_decision=None)
+
+        unreviewed = store.get_unreviewed_documents("request1")
+        assert [doc.filename for doc in unreviewed] == [
+            "doc1.txt", "doc2.txt", "doc3.txt", "doc4.txt"
+        ]
+
+    def test_update_after_direct_mutation(self, store, sample_documents):
+        """Test that indexes follow documents mutated before update_document"""
+        store.add_documents("request1", sample_documents)
+
+        # The review tab sets fields on the Document before updating the store
+        doc = store.get_document("request1", "doc2.txt")
+        doc.classification = "responsive"
+        doc.human_decision = "responsive"
+        store.update_document("request1", "doc2.txt", human_decision="responsive")
+
+        assert store.get_documents_by_classification("request1", "non-responsive") == []
+        assert len(store.get_documents_by_classification("request1", "responsive")) == 3
+        assert [d.filename for d in store.get_reviewed_documents("request1")] == ["doc2.txt"]
+
+    def test_statistics_follow_updates(self, store, sample_documents):
+        """Test that statistics stay correct through replacements and updates"""
+        store.add_documents("request1", sample_documents)
+
+        # Replacing a document must not double count it
+        store.add_document("request1", Document(filename="doc4.txt", content="New"))
+        store.update_document("request1", "doc3.txt", exemptions=[{"type": "PII"}])
+        store.update_document("request1", "doc3.txt", human_decision="non-responsive")
+
+        stats = store.get_statistics("request1")
+        assert stats == {
+            "total": 4,
+            "reviewed": 1,
+            "responsive": 1,
+            "non_responsive": 2,
+            "uncertain": 0,
+            "has_exemptions": 1,
+        }
+
+        store.clear_request("request1")
+        assert store.get_statistics("request1")["total"] == 0
+
+    def test_reads_do_not_create_requests(self, store):
+        """Test that querying an unknown request leaves the store empty"""
+        store.get_document("ghost", "x.txt")
+        store.get_documents("ghost")
+        store.get_unreviewed_documents("ghost")
+        store.get_statistics("ghost")
+
+        assert store.has_documents("ghost") is False
+        assert store._documents == {}
@@ -0,0 +1,94 @@
+"""Tests for the persistent embedding cache."""
+
+import hashlib
+import sqlite3
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.services.embedding_cache import CachedEmbeddingClient
+
+
+@pytest.fixture
+def embedding_service():
+    """Create a fake embedding service that records generated texts."""
+    service = Mock()
+    service.model = "test-embedding-model"
+    service.generate_content_hash.side_effect = (
+        lambda text: hashlib.sha256(text.encode("utf-8")).hexdigest()
+    )
+    service.generate_embeddings.side_effect = (
+        lambda texts: [[float(len(text)), 0.5] for text in texts]
+    )
+    return service
+
+
+class TestCachedEmbeddingClient:
+    """Test suite for CachedEmbeddingClient."""
+
+    def test_misses_are_computed_once(self, embedding_service, tmp_path):
+        """Test that repeated texts are only embedded on the first run."""
+        db_path = tmp_path / "cache.db"
+        client = CachedEmbeddingClient(embedding_service, db_path=db_path)
+        first = client.get_or_compute(["alpha", "beta", "alpha"])
+        client.close()
+
+        client = CachedEmbeddingClient(embedding_service, db_path=db_path)
+        second = client.get_or_compute(["beta", "alpha"])
+        client.close()
+
+        assert first == [[5.0, 0.5], [4.0, 0.5], [5.0, 0.5]]
+        assert second == [[4.0, 0.5], [5.0, 0.5]]
+        embedding_service.generate_embeddings.assert_called_once_with(["alpha", "beta"])
+
+    def test_expired_entries_are_recomputed(self, embedding_service, tmp_path):
+        """Test that entries older than the TTL are treated as misses."""
+        db_path = tmp_path / "cache.db"
+        CachedEmbeddingClient(embedding_service, db_path=db_path).get_or_compute(["a"])
+
+        client = CachedEmbeddingClient(embedding_service, db_path=db_path, ttl_seconds=-1)
+        client.get_or_compute(["a"])
+
+        assert embedding_service.generate_embeddings.call_count == 2
+
+    def test_failed_embeddings_are_not_cached(self, embedding_service, tmp_path):
+        """Test that failed generations return None and are retried later."""
+        embedding_service.generate_embeddings.side_effect = lambda texts: [None] * len(texts)
+        client = CachedEmbeddingClient(embedding_service, db_path=tmp_path / "cache.db")
+
+        assert client.get_or_compute(["a"]) == [None]
+        client.get_or_compute(["a"])
+        assert embedding_service.generate_embeddings.call_count == 2
+
+    def test_unusable_cache_falls_back_to_service(self, embedding_service, tmp_path):
+        """Test that an unopenable cache path computes embeddings directly."""
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        client = CachedEmbeddingClient(embedding_service, db_path=blocker / "cache.db")
+
+        assert client.get_or_compute(["a"]) == [[1.0, 0.5]]
+
+    def test_locked_cache_falls_back_to_service(self, embedding_service, tmp_path):
+        """Test that a cache error at runtime neither fails nor hangs embedding."""
+        db_path = tmp_path / "cache.db"
+        client = CachedEmbeddingClient(embedding_service, db_path=db_path)
+        locker = sqlite3.connect(db_path)
+        locker.execute("BEGIN EXCLUSIVE")
+        client._conn.execute("PRAGMA busy_timeout = 0")
+
+        assert client.get_or_compute(["a", "bb"]) == [[1.0, 0.5], [2.0, 0.5]]
+
+        locker.rollback()
+        locker.close()
+        client.close()
+
+    def test_failed_write_still_returns_embeddings(self, embedding_service, tmp_path):
+        """Test that embeddings are returned when they cannot be stored."""
+        client = CachedEmbeddingClient(embedding_service, db_path=tmp_path / "cache.db")
+
+        with patch.object(
+            client, "_put", side_effect=sqlite3.OperationalError("disk I/O error")
+        ):
+            assert client.get_or_compute(["a"]) == [[1.0, 0.5]]
+        assert client.get_or_compute(["a"]) == [[1.0, 0.5]]
+        assert embedding_service.generate_embeddings.call_count == 2
@@ -0,0 +1,54 @@
+"""Tests for batched embedding generation."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.services.embedding_service import EmbeddingService
+
+
+@pytest.fixture
+def service():
+    """Create an EmbeddingService with a fake OpenAI client."""
+    service = EmbeddingService.__new__(EmbeddingService)
+    service.model = "test-embedding-model"
+    service.max_chars = 8000
+    service.max_batch_size = 100
+    service.max_batch_chars = 400_000
+    service.client = Mock()
+
+    def create(model, input):
+        if len(input) > service.fail_above:
+            raise RuntimeError("request too large")
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[float(len(text))])
+            for i, text in enumerate(input)
+        ])
+
+    service.fail_above = 100
+    service.client.embeddings.create.side_effect = create
+    return service
+
+
+class TestGenerateEmbeddings:
+    """Test suite for EmbeddingService.generate_embeddings."""
+
+    def test_requests_are_bounded_by_characters(self, service):
+        """Test that a request closes once its character budget is reached."""
+        service.max_batch_chars = 10
+        result = service.generate_embeddings(["aaaa", "bbbb", "cccc", "aaaa"])
+
+        assert result == [[4.0], [4.0], [4.0], [4.0]]
+        sizes = [len(call.kwargs["input"])
+                 for call in service.client.embeddings.create.call_args_list]
+        assert sizes == [2, 1]
+
+    def test_failed_request_is_retried_in_halves(self, service):
+        """Test that a failing batch is split once before giving up."""
+        service.fail_above = 2
+        result = service.generate_embeddings(["a", "bb", "ccc", "dddd"])
+        assert result == [[1.0], [2.0], [3.0], [4.0]]
+
+        service.fail_above = 0
+        assert service.generate_embeddings(["x", "yy"]) == [None, None]
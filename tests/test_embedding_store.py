@@ -0,0 +1,93 @@
+"""Tests for the in-memory embedding store."""
+
+import pytest
+
+from src.services.embedding_store import EmbeddingStore
+
+
+@pytest.fixture
+def store():
+    """Create a store with three embeddings in one request."""
+    store = EmbeddingStore()
+    store.add_embedding("req1", "a.txt", [1.0, 0.0, 0.0], "hash_a")
+    store.add_embedding("req1", "b.txt", [0.9, 0.1, 0.0], "hash_b")
+    store.add_embedding("req1", "c.txt", [0.0, 1.0, 0.0], "hash_c")
+    return store
+
+
+class TestEmbeddingStore:
+    """Test suite for EmbeddingStore."""
+
+    def test_find_similar_sorted_by_score(self, store):
+        """Test that matches above the threshold are returned best first."""
+        results = store.find_similar("req1", [2.0, 0.05, 0.0], threshold=0.5)
+
+        assert [name for name, _ in results] == ["a.txt", "b.txt"]
+        assert results[0][1] == pytest.approx(0.9997, abs=1e-3)
+
+    def test_find_similar_is_request_scoped(self, store):
+        """Test that other requests' embeddings are not compared."""
+        assert store.find_similar("req2", [1.0, 0.0, 0.0]) == []
+
+    def test_zero_vector_matches_nothing(self, store):
+        """Test that a zero embedding has no similar documents."""
+        assert store.find_similar("req1", [0.0, 0.0, 0.0], threshold=0.0) == [
+            ("a.txt", 0.0), ("b.txt", 0.0), ("c.txt", 0.0)
+        ]
+        assert store.find_similar("req1", [0.0, 0.0, 0.0], threshold=0.1) == []
+
+    def test_re_adding_replaces_embedding(self, store):
+        """Test that adding a filename again replaces its embedding."""
+        store.add_embedding("req1", "a.txt", [0.0, 0.0, 1.0], "hash_a2")
+
+        results = store.find_similar("req1", [0.0, 0.0, 1.0])
+        assert results == [("a.txt", pytest.approx(1.0))]
+
+    def test_matrix_grows_past_initial_capacity(self):
+        """Test that many embeddings can be added and searched."""
+        store = EmbeddingStore()
+        for i in range(40):
+            store.add_embedding("req1", f"doc{i}.txt", [1.0, float(i)], f"hash{i}")
+
+        results = store.find_similar("req1", [1.0, 39.0], threshold=0.9999)
+        assert results[0][0] == "doc39.txt"
+
+    def test_round_trip_rebuilds_index(self, store):
+        """Test that from_dict restores similarity search."""
+        data = store.to_dict()
+        restored = EmbeddingStore.from_dict(data)
+
+        assert data["embeddings"]["req1"]["b.txt"] == pytest.approx([0.9, 0.1, 0.0])
+        assert type(data["embeddings"]["req1"]["b.txt"]) is list
+        assert restored.find_similar("req1", [0.0, 1.0, 0.0])[0][0] == "c.txt"
+
+    def test_clear_request(self, store):
+        """Test that clearing a request removes its embeddings."""
+        store.clear_request("req1")
+
+        assert store.get_processed_count("req1") == 0
+        assert store.find_similar("req1", [1.0, 0.0, 0.0]) == []
+        assert store.find_exact("req1", "hash_a") is None
+
+    def test_find_exact_returns_first_match(self, store):
+        """Test that exact lookups return the first document with the hash."""
+        store.add_embedding("req1", "d.txt", [1.0, 0.0, 0.0], "hash_b")
+
+        assert store.find_exact("req1", "hash_b") == "b.txt"
+        assert store.find_exact("req2", "hash_b") is None
+        assert EmbeddingStore.from_dict(store.to_dict()).find_exact(
+            "req1", "hash_b"
+        ) == "b.txt"
+
+        store.add_embedding("req1", "b.txt", [0.9, 0.1, 0.0], "hash_b2")
+        assert store.find_exact("req1", "hash_b") == "d.txt"
+        assert store.find_exact("req1", "hash_b2") == "b.txt"
+
+    def test_find_similar_batch_matches_single_queries(self, store):
+        """Test that batched queries agree with one-at-a-time queries."""
+        queries = [[2.0, 0.05, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+        assert store.find_similar_batch("req1", queries, threshold=0.5) == [
+            store.find_similar("req1", query, threshold=0.5) for query in queries
+        ]
+        assert store.find_similar_batch("req2", queries) == [[], [], []]
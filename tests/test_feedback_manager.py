@@ -167,6 +167,21 @@ class TestFeedbackManager:
         assert result is not None
         assert len(result.document_snippet) == 203  # 200 chars + "..."
         assert result.document_snippet.endswith("...")
+
+    def test_repeated_snippets_are_shared(self, feedback_manager, sample_document):
+        """Test that correcting the same document again reuses its snippet."""
+        first = feedback_manager.add_feedback(sample_document, "request_1", "non_responsive")
+        second = feedback_manager.add_feedback(sample_document, "request_1", "uncertain")
+
+        assert first.document_snippet is second.document_snippet
+
+    def test_snippet_for_document_without_content(self, feedback_manager):
+        """Test that documents with no content get an empty snippet."""
+        doc = Document(filename="empty.txt", content=None, classification="responsive")
+
+        result = feedback_manager.add_feedback(doc, "request_1", "non_responsive")
+
+        assert result.document_snippet == ""
     
     def test_feedback_prompt_format(self, feedback_manager, sample_document):
         """Test that feedback is formatted correctly for prompts."""
@@ -180,4 +195,31 @@ class TestFeedbackManager:
         assert "ai_classification" in example
         assert "human_correction" in example
         assert "confidence" in example
-        assert example["confidence"] == 0.8
\ No newline at end of file
+        assert example["confidence"] == 0.8
+
+    def test_examples_cached_until_feedback_changes(self, feedback_manager, sample_document):
+        """Test that prompt examples are rebuilt only after feedback changes."""
+        feedback_manager.add_feedback(sample_document, "request_1", "non_responsive")
+        first = feedback_manager.get_all_feedback("request_1")
+        assert feedback_manager.get_all_feedback("request_1") is first
+
+        feedback_manager.add_feedback(sample_document, "request_1", "uncertain")
+        second = feedback_manager.get_all_feedback("request_1")
+        assert second is not first
+        assert len(second) == 2
+
+        feedback_manager.clear_feedback("request_1")
+        assert feedback_manager.get_all_feedback("request_1") == []
+
+    def test_rules_cached_until_feedback_changes(self, feedback_manager):
+        """Test that pre-classifier rules are compiled once per feedback version."""
+        for name in ("email_a.txt", "email_b.txt", "email_c.txt"):
+            document = Document(filename=name, content="Lunch plans", classification="responsive")
+            feedback_manager.add_feedback(document, "request_1", "non_responsive")
+
+        rules = feedback_manager.get_feedback_rules("request_1")
+        assert rules == {"email": ("non_responsive", 3, 3)}
+        assert feedback_manager.get_feedback_rules("request_1") is rules
+
+        feedback_manager.clear_feedback("request_1")
+        assert feedback_manager.get_feedback_rules("request_1") == {}
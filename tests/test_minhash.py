@@ -0,0 +1,58 @@
+"""Tests for MinHash near-duplicate detection."""
+
+from src.services.minhash import MAX_NEAR_DUPLICATE_SCORE, NearDuplicateIndex
+
+BASE_TEXT = (
+    "The city council met on Tuesday to discuss the annual budget for road "
+    "maintenance, snow removal, park improvements, and library hours. Members "
+    "agreed to revisit the transit proposal at the next scheduled session after "
+    "staff prepare updated cost estimates for each of the three options."
+)
+
+
+class TestNearDuplicateIndex:
+    """Test suite for NearDuplicateIndex."""
+
+    def test_reformatted_copy_is_near_duplicate(self):
+        """Test that case and whitespace changes still match."""
+        index = NearDuplicateIndex()
+        assert index.find_or_insert("original.txt", BASE_TEXT) is None
+
+        match = index.find_or_insert("copy.txt", "  " + BASE_TEXT.upper().replace(" ", "\n"))
+
+        # Reported below the exact-duplicate range; the content hashes differ
+        assert match == ("original.txt", MAX_NEAR_DUPLICATE_SCORE)
+
+    def test_unrelated_document_is_not_matched(self):
+        """Test that different documents are indexed separately."""
+        index = NearDuplicateIndex()
+        index.find_or_insert("original.txt", BASE_TEXT)
+
+        other = "Invoice for office supplies: paper, toner, staples, and folders."
+        assert index.find_or_insert("invoice.txt", other) is None
+        assert index.find_or_insert("invoice_copy.txt", other) == (
+            "invoice.txt", MAX_NEAR_DUPLICATE_SCORE
+        )
+
+    def test_small_edit_below_threshold_is_not_matched(self):
+        """Test that a single-word edit in a short text falls below 0.9."""
+        index = NearDuplicateIndex()
+        index.find_or_insert("original.txt", BASE_TEXT)
+
+        edited = BASE_TEXT.replace("Tuesday", "Wednesday")
+        # Changing one word alters five of the ~40 shingles
+        assert index.find_or_insert("edited.txt", edited) is None
+
+    def test_reordered_words_are_not_matched(self):
+        """Test that shingles depend on word order, not just the words."""
+        index = NearDuplicateIndex()
+        index.find_or_insert("original.txt", BASE_TEXT)
+
+        reordered = " ".join(reversed(BASE_TEXT.split()))
+        assert index.find_or_insert("reordered.txt", reordered) is None
+
+    def test_empty_text_is_ignored(self):
+        """Test that texts without words are not indexed."""
+        index = NearDuplicateIndex()
+        assert index.find_or_insert("blank.txt", " \n ") is None
+        assert index.find_or_insert("blank2.txt", "") is None
@@ -0,0 +1,170 @@
+"""Tests for duplicate detection in the parallel embedding processor."""
+
+import sqlite3
+import time
+from unittest.mock import patch
+
+import numpy as np
+
+from src.langgraph.nodes.document_loader import read_text_with_hash
+from src.processing import parallel_embeddings
+from src.processing.parallel_embeddings import EmbeddingResult, ParallelEmbeddingProcessor
+from src.services.embedding_cache import CachedEmbeddingClient
+from src.services.embedding_store import EmbeddingStore
+
+
+def make_result(task_id, filename, embedding, content_hash):
+    """Create a successful embedding result."""
+    return EmbeddingResult(
+        task_id=task_id,
+        filename=filename,
+        content=filename,
+        embedding=None if embedding is None else np.asarray(embedding, dtype=np.float32),
+        content_hash=content_hash,
+    )
+
+
+class TestDetectDuplicates:
+    """Test suite for windowed duplicate detection."""
+
+    def test_window_matches_sequential_detection(self):
+        """Test that results are compared with the store and earlier window results."""
+        store = EmbeddingStore()
+        store.add_embedding("req1", "stored.txt", [1.0, 0.0, 0.0], "hash_stored")
+        window = [
+            make_result(0, "a.txt", [0.0, 1.0, 0.0], "hash_a"),
+            make_result(1, "b.txt", [0.1, 1.0, 0.0], "hash_b"),
+            make_result(2, "c.txt", [1.0, 0.05, 0.0], "hash_c"),
+            make_result(3, "d.txt", [0.0, 0.0, 1.0], "hash_a"),
+            make_result(4, "e.txt", None, "hash_e"),
+            EmbeddingResult(task_id=5, filename="f.txt", error="unreadable"),
+        ]
+
+        ParallelEmbeddingProcessor(num_workers=1)._detect_duplicates(
+            window, "req1", store
+        )
+
+        documents = [result.document for result in window]
+        assert [doc.duplicate_of if doc else None for doc in documents] == [
+            None, "a.txt", "stored.txt", "a.txt", None, None
+        ]
+        assert documents[3].similarity_score == 1.0
+        assert not documents[3].embedding_generated
+        assert not documents[4].is_duplicate
+        assert store.get_processed_count("req1") == 4
+
+
+class TestReadBatches:
+    """Test suite for the read pass before embedding."""
+
+    def test_exact_duplicates_are_not_queued(self, tmp_path):
+        """Test that copies of stored or earlier documents resolve without a task."""
+        store = EmbeddingStore()
+        (tmp_path / "stored.txt").write_text("already stored")
+        (tmp_path / "a.txt").write_text("first copy")
+        (tmp_path / "b.txt").write_text("first copy")
+        (tmp_path / "c.txt").write_text("already stored")
+        (tmp_path / "d.txt").write_text("unique")
+        _, stored_hash = read_text_with_hash(tmp_path / "stored.txt")
+        store.add_embedding("req1", "stored.txt", [1.0, 0.0], stored_hash)
+        paths = [tmp_path / name for name in ("a.txt", "b.txt", "c.txt", "d.txt", "missing.txt")]
+
+        resolved = []
+        batches = list(ParallelEmbeddingProcessor(num_workers=1)._read_batches(
+            paths, "req1", store, 1, resolved
+        ))
+
+        assert [[(task.task_id, task.content) for task in batch] for batch in batches] == [
+            [(0, "first copy")], [(3, "unique")]
+        ]
+        by_id = {result.task_id: result for result in resolved}
+        assert sorted(by_id) == [1, 2, 4]
+        assert by_id[1].document.duplicate_of == "a.txt"
+        assert by_id[1].document.content == "first copy"
+        assert by_id[2].document.duplicate_of == "stored.txt"
+        assert by_id[4].error and by_id[4].document is None
+
+
+    def test_reads_stay_within_window(self, tmp_path):
+        """Test that taking one batch reads only the read-ahead window beyond it."""
+        paths = []
+        for i in range(100):
+            path = tmp_path / f"doc{i}.txt"
+            path.write_text(f"Document {i} content")
+            paths.append(path)
+        read_document = parallel_embeddings._read_document
+        read = []
+
+        def counting_read(path):
+            read.append(path)
+            return read_document(path)
+
+        with patch("src.processing.parallel_embeddings._read_document", counting_read):
+            batches = ParallelEmbeddingProcessor(num_workers=1)._read_batches(
+                paths, "req1", EmbeddingStore(), 4, []
+            )
+            first = next(batches)
+            batches.close()
+
+        assert [task.task_id for task in first] == [0, 1, 2, 3]
+        assert len(read) <= 4 + parallel_embeddings._READ_AHEAD
+
+class TestProcessEmbeddings:
+    """Test suite for embedding in worker processes."""
+
+    def test_failed_embedding_call_reports_every_document(self, tmp_path):
+        """Test that a batch whose embedding call raises still returns results."""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"doc{i}.txt"
+            path.write_text(f"Document {i} content")
+            paths.append(path)
+        processor = ParallelEmbeddingProcessor(num_workers=2)
+
+        with (
+            patch("src.processing.parallel_embeddings.EmbeddingService"),
+            patch("src.services.embedding_cache.EMBEDDING_CACHE_PATH", tmp_path / "cache.db"),
+            patch.object(
+                CachedEmbeddingClient, "get_or_compute",
+                side_effect=sqlite3.OperationalError("database is locked"),
+            ),
+        ):
+            start = time.monotonic()
+            documents = processor.process_embeddings(paths, "req1", EmbeddingStore())
+            processor.close()
+
+        assert time.monotonic() - start < 10
+        assert documents == {}
+        assert processor._documents_processed == 6
+
+    def test_every_document_is_queued_and_returned(self, tmp_path):
+        """Test that batches queued in several rounds all come back in place."""
+        paths = []
+        for i in range(20):
+            path = tmp_path / f"doc{i}.txt"
+            # Every fifth document copies the one before it
+            path.write_text(f"Document {i - i % 5 // 4} content")
+            paths.append(path)
+        processor = ParallelEmbeddingProcessor(num_workers=1)
+
+        def get_or_compute(texts, hashes):
+            # Orthogonal embeddings keep every original distinct
+            return [
+                [1.0 if i == int(text.split()[1]) else 0.0 for i in range(20)]
+                for text in texts
+            ]
+
+        with (
+            patch("src.processing.parallel_embeddings.EmbeddingService"),
+            patch("src.services.embedding_cache.EMBEDDING_CACHE_PATH", tmp_path / "cache.db"),
+            patch.object(CachedEmbeddingClient, "get_or_compute", side_effect=get_or_compute),
+        ):
+            documents = processor.process_embeddings(paths, "req1", EmbeddingStore())
+            processor.close()
+
+        assert sorted(documents) == sorted(paths)
+        copies = [path.name for path, document in documents.items() if document.is_duplicate]
+        assert sorted(copies) == sorted(f"doc{i}.txt" for i in (4, 9, 14, 19))
+        assert documents[paths[4]].duplicate_of == "doc3.txt"
+        assert sum(document.embedding_generated for document in documents.values()) == 16
+        assert processor._documents_processed == 20
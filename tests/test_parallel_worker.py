@@ -1,6 +1,7 @@
 """Tests for the parallel document processing module."""
 
 import multiprocessing as mp
+import os
 import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch, Mock
@@ -16,6 +17,11 @@ from src.processing.parallel_worker import (
 )
 
 
+def _exit_immediately(workflow, task_queue, result_queue):
+    """Worker target that dies without sending results."""
+    os._exit(3)
+
+
 # Note: We no longer need a mock workflow since the real workflow
 # is created inside each worker process
 
@@ -92,6 +98,20 @@ class TestParallelDocumentProcessor:
         assert len(batches[2]) == 3
         assert len(batches[3]) == 1
 
+    def test_create_batches_queues_largest_first(self, processor, tmp_path):
+        """Test that larger documents are batched ahead of smaller ones."""
+        tasks = []
+        for i, size in enumerate([10, 500, 50, 1000]):
+            doc_path = tmp_path / f"doc{i}.txt"
+            doc_path.write_text("x" * size)
+            tasks.append(
+                ProcessingTask(document_path=doc_path, foia_request="test", task_id=i)
+            )
+
+        processor.batch_size = 2
+        batches = processor._create_batches(tasks)
+        assert [[task.task_id for task in batch] for batch in batches] == [[3, 1], [2, 0]]
+
     def test_process_documents_success(self, processor, tmp_path):
         """Test successful document processing."""
         # Create test documents
@@ -158,6 +178,62 @@ class TestParallelDocumentProcessor:
         assert len(errors) == 1
         assert "Error processing document 1" in errors[0]
 
+    def test_workers_are_reused_between_calls(self, processor, tmp_path):
+        """Test that worker processes stay alive between calls until closed."""
+        doc_path = tmp_path / "doc.txt"
+        doc_path.write_text("Reused worker content")
+
+        assert len(processor.process_documents([doc_path], "Test FOIA request")) == 1
+        pids = [worker.pid for worker in processor._pool.workers]
+        assert len(processor.process_documents([doc_path], "Test FOIA request")) == 1
+        assert [worker.pid for worker in processor._pool.workers] == pids
+
+        workers = processor._pool.workers
+        processor.close()
+        assert not any(worker.is_alive() for worker in workers)
+
+    def test_dead_workers_are_reported_without_hanging(self, processor, tmp_path):
+        """Test that collection stops promptly when every worker dies."""
+        doc_path = tmp_path / "doc.txt"
+        doc_path.write_text("Never processed")
+        errors = []
+        processor.set_error_callback(errors.append)
+
+        with patch(
+            "src.processing.parallel_worker.process_document_batch", _exit_immediately
+        ):
+            start = time.monotonic()
+            assert processor.process_documents([doc_path], "Test FOIA request") == []
+
+        assert time.monotonic() - start < 5
+        assert errors == [
+            "Worker process died with exit code 3",
+            "Worker process died with exit code 3",
+            "1 documents were not processed",
+        ]
+        assert processor._pool.workers == []
+
+    def test_failed_run_does_not_leak_results_into_next_run(self, processor, tmp_path):
+        """Test that a callback error replaces the workers and their queues."""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"doc{i}.txt"
+            path.write_text(f"Document {i} content")
+            paths.append(path)
+
+        def fail(document):
+            raise RuntimeError("callback failed")
+
+        processor.set_document_callback(fail)
+        with pytest.raises(RuntimeError):
+            processor.process_documents(paths, "Test FOIA request")
+        assert processor._pool.workers == []
+
+        processor.set_document_callback(None)
+        documents = processor.process_documents(paths[:2], "Test FOIA request")
+        assert [document.filename for document in documents] == ["doc0.txt", "doc1.txt"]
+        processor.close()
+
     def test_processing_rate(self, processor):
         """Test processing rate calculation."""
         # Initial rate should be 0
@@ -200,6 +276,44 @@ class TestParallelDocumentProcessor:
         assert result.error is None
         assert result.processing_time > 0
 
+    def test_worker_function_reuses_embedding_content(self):
+        """Test that content from embedding metadata is not read again."""
+        task_queue = mp.Queue()
+        result_queue = mp.Queue()
+
+        task = ProcessingTask(
+            document_path=Path("already_read.txt"),
+            foia_request="Test request",
+            task_id=0,
+            embedding_metadata=Document(
+                filename="already_read.txt", content="Embedded content"
+            ),
+        )
+        task_queue.put([task])
+        task_queue.put(None)
+
+        process_document_batch(None, task_queue, result_queue)
+
+        # The main process already has the content, so it is not sent back
+        result = result_queue.get(timeout=5.0)
+        assert result.error is None
+        assert result.content_omitted
+        assert result.document.content == ""
+
+    def test_omitted_content_is_restored(self, processor):
+        """Test that documents get their content back from the embedding metadata."""
+        doc_path = Path("already_read.txt")
+        metadata = {doc_path: Document(filename="already_read.txt", content="Embedded content")}
+        received = []
+        processor.set_document_callback(received.append)
+
+        documents = processor.process_documents(
+            [doc_path], "Test FOIA request", embedding_metadata=metadata
+        )
+
+        assert [doc.content for doc in documents] == ["Embedded content"]
+        assert received[0].content == "Embedded content"
+
     def test_worker_function_error_handling(self, tmp_path):
         """Test worker function error handling."""
         # Create queues
@@ -0,0 +1,106 @@
+"""Tests for the rule-based pre-classifier node."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.langgraph.nodes.pre_classifier import compile_feedback_rules, pre_classify
+
+
+@pytest.fixture
+def feedback_examples():
+    """Create feedback examples with one unanimous filename prefix."""
+    return [
+        {"document_filename": "email_lunch.txt", "human_correction": "non_responsive"},
+        {"document_filename": "email_parking.txt", "human_correction": "non_responsive"},
+        {"document_filename": "email_picnic.txt", "human_correction": "non_responsive"},
+        {"document_filename": "memo_sky.txt", "human_correction": "responsive"},
+        {"document_filename": "memo_budget.txt", "human_correction": "non_responsive"},
+    ]
+
+
+class TestPreClassifier:
+    """Test suite for pre_classify."""
+
+    def test_long_document_without_rules_falls_through(self):
+        """Test that ordinary documents are left for the LLM classifier."""
+        state = {"filename": "report_q1.txt", "content": "Quarterly budget report " * 5}
+        assert pre_classify(state) == {}
+
+    def test_short_document(self):
+        """Test that very short documents are marked uncertain."""
+        result = pre_classify({"filename": "note.txt", "content": "See attached."})
+        assert result["classification"] == "uncertain"
+
+    def test_error_state_is_skipped(self):
+        """Test that documents with errors are not pre-classified."""
+        assert pre_classify({"filename": "x.txt", "content": "", "error": "boom"}) == {}
+
+    def test_unanimous_prefix_rule(self, feedback_examples):
+        """Test that unanimous filename corrections classify matching files."""
+        audit_manager = Mock()
+        state = {
+            "filename": "email_conference_room.txt",
+            "content": "Please book the large conference room for Tuesday.",
+            "feedback_examples": feedback_examples,
+            "audit_manager": audit_manager,
+            "request_id": "request_1",
+        }
+
+        result = pre_classify(state)
+
+        assert result["classification"] == "non_responsive"
+        assert result["confidence"] == 1.0
+        assert "email" in result["justification"]
+        audit_manager.log_classification.assert_not_called()
+        audit_manager.log_rule_classification.assert_called_once_with(
+            filename="email_conference_room.txt",
+            result="non_responsive",
+            rule="'email' filename rule, 3 of 3 corrections agreed",
+            request_id="request_1",
+        )
+
+    def test_compiled_rules_in_state_are_used(self):
+        """Test that rules supplied with the state take precedence over examples."""
+        state = {
+            "filename": "memo_budget.txt",
+            "content": "Budget memo for the coming fiscal year.",
+            "feedback_examples": [],
+            "feedback_rules": {"memo": ("responsive", 4, 5)},
+        }
+
+        result = pre_classify(state)
+
+        assert result["classification"] == "responsive"
+        assert result["confidence"] == pytest.approx(0.8)
+
+    def test_mixed_prefix_has_no_rule(self, feedback_examples):
+        """Test that prefixes with disagreeing corrections produce no rule."""
+        rules = compile_feedback_rules(feedback_examples)
+        assert rules == {"email": ("non_responsive", 3, 3)}
+
+    def test_too_few_corrections_is_not_a_rule(self):
+        """Test that two agreeing corrections are not enough support for a rule."""
+        examples = [
+            {"document_filename": "memo_a.txt", "human_correction": "responsive"},
+            {"document_filename": "memo_b.txt", "human_correction": "responsive"},
+        ]
+        assert compile_feedback_rules(examples) == {}
+
+    def test_majority_rule_confidence_is_agreement(self):
+        """Test that a strong majority makes a rule with its observed ratio."""
+        examples = [
+            {"document_filename": f"memo_{i}.txt", "human_correction": "responsive"}
+            for i in range(4)
+        ] + [{"document_filename": "memo_x.txt", "human_correction": "non_responsive"}]
+        state = {
+            "filename": "memo_new.txt",
+            "content": "Memo about the sky project schedule.",
+            "feedback_examples": examples,
+        }
+
+        result = pre_classify(state)
+
+        assert result["classification"] == "responsive"
+        assert result["confidence"] == pytest.approx(0.8)
+        assert "4 of 5" in result["justification"]
@@ -93,6 +93,22 @@ class TestRequestManager:
         assert requests[1] == request2
         assert requests[2] == request1
         
+    def test_list_requests_after_delete(self, manager):
+        """Test that deleting a request keeps the others in order"""
+        request1 = manager.create_request("Request 1")
+        request2 = manager.create_request("Request 2")
+        request3 = manager.create_request("Request 3")
+
+        manager.delete_request(request2.id)
+
+        # Same order as a stable newest-first sort, including same-tick ties
+        assert manager.list_requests() == sorted(
+            [request1, request3], key=lambda r: r.created_at, reverse=True
+        )
+        # The returned list is a copy
+        manager.list_requests().clear()
+        assert len(manager.list_requests()) == 2
+
     def test_delete_request(self, manager):
         """Test deleting a request"""
         request1 = manager.create_request("Request 1")
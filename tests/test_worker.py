@@ -0,0 +1,141 @@
+"""Tests for the sequential embedding pass in ProcessingWorker."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.langgraph.nodes.document_loader import read_text_with_hash
+from src.processing.worker import ProcessingWorker
+from src.services.embedding_store import EmbeddingStore
+
+# Distinct words so a one-word edit leaves most shingles intact
+REPORT_TEXT = " ".join(f"finding{i}" for i in range(300))
+
+
+@pytest.fixture
+def embedding_client():
+    """Patch the cached client with one returning orthogonal embeddings."""
+    with (
+        patch("src.processing.worker.EmbeddingService"),
+        patch("src.processing.worker.CachedEmbeddingClient") as client_class,
+    ):
+        client = client_class.return_value
+        calls = []
+
+        def get_or_compute(texts, hashes):
+            calls.append(list(texts))
+            start = sum(len(call) for call in calls[:-1])
+            return [
+                [1.0 if i == start + n else 0.0 for i in range(16)]
+                for n in range(len(texts))
+            ]
+
+        client.get_or_compute.side_effect = get_or_compute
+        client.calls = calls
+        yield client
+
+
+@pytest.fixture
+def store():
+    """Create an empty embedding store."""
+    return EmbeddingStore()
+
+
+def make_worker(tmp_path, store):
+    """Create a worker for the sequential embedding pass."""
+    return ProcessingWorker(
+        folder_path=tmp_path,
+        foia_request="All records about the Blue Sky project.",
+        request_id="req1",
+        embedding_store=store,
+    )
+
+
+def write(tmp_path, name, text):
+    """Write a document and return its path."""
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+class TestSequentialEmbeddings:
+    """Test suite for ProcessingWorker._generate_embeddings_sequential."""
+
+    def test_exact_duplicate_of_stored_document(self, tmp_path, store, embedding_client):
+        """Test that a copy of a stored document is resolved without embedding."""
+        path = write(tmp_path, "copy.txt", "Budget memo for the Blue Sky project.")
+        _, content_hash = read_text_with_hash(path)
+        store.add_embedding("req1", "stored.txt", [0.0] * 16, content_hash)
+        worker = make_worker(tmp_path, store)
+
+        worker._generate_embeddings_sequential([path])
+
+        document = worker._document_metadata[path]
+        assert document.is_duplicate
+        assert document.duplicate_of == "stored.txt"
+        assert document.similarity_score == 1.0
+        assert embedding_client.calls == []
+
+    def test_exact_duplicate_within_run(self, tmp_path, store, embedding_client):
+        """Test that identical files in one run are embedded once."""
+        first = write(tmp_path, "a.txt", "Budget memo for the Blue Sky project.")
+        second = write(tmp_path, "b.txt", "Budget memo for the Blue Sky project.")
+        worker = make_worker(tmp_path, store)
+
+        worker._generate_embeddings_sequential([first, second])
+
+        assert not worker._document_metadata[first].is_duplicate
+        assert worker._document_metadata[second].duplicate_of == "a.txt"
+        assert embedding_client.calls == [["Budget memo for the Blue Sky project."]]
+        assert worker.stats["duplicates"] == 1
+
+    def test_minhash_match_is_still_stored(self, tmp_path, store, embedding_client):
+        """Test that a MinHash match keeps its match and is embedded and stored."""
+        original = write(tmp_path, "report.txt", REPORT_TEXT)
+        edited = write(tmp_path, "report_edit.txt", REPORT_TEXT.replace("finding250", "edited"))
+        worker = make_worker(tmp_path, store)
+
+        worker._generate_embeddings_sequential([original, edited])
+
+        document = worker._document_metadata[edited]
+        assert document.duplicate_of == "report.txt"
+        assert 0.9 <= document.similarity_score < 0.99
+        assert document.embedding_generated
+        _, edited_hash = read_text_with_hash(edited)
+        assert store.find_exact("req1", edited_hash) == "report_edit.txt"
+
+    def test_read_error_is_recorded(self, tmp_path, store, embedding_client):
+        """Test that an unreadable file becomes a plain original without content."""
+        missing = tmp_path / "missing.txt"
+        present = write(tmp_path, "present.txt", "Budget memo for the Blue Sky project.")
+        worker = make_worker(tmp_path, store)
+
+        worker._generate_embeddings_sequential([missing, present])
+
+        document = worker._document_metadata[missing]
+        assert document.content == ""
+        assert not document.is_duplicate
+        assert not document.embedding_generated
+        assert worker._document_metadata[present].embedding_generated
+
+    def test_cancel_stops_between_batches(self, tmp_path, store, embedding_client):
+        """Test that cancelling during a batch skips the remaining batches."""
+        paths = [
+            write(tmp_path, f"doc{i}.txt", f"Distinct memo number {i} about budgets.")
+            for i in range(3)
+        ]
+        worker = make_worker(tmp_path, store)
+        progress = []
+        worker.embedding_progress.connect(lambda current, total: progress.append(current))
+
+        def cancel_after_first(texts, hashes):
+            worker.cancel()
+            return [[1.0] + [0.0] * 15]
+
+        embedding_client.get_or_compute.side_effect = cancel_after_first
+        with patch("src.processing.worker._EMBED_BATCH_SIZE", 1):
+            worker._generate_embeddings_sequential(paths)
+
+        assert embedding_client.get_or_compute.call_count == 1
+        assert list(worker._document_metadata) == [paths[0]]
+        assert progress == [0, 1]
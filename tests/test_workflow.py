@@ -0,0 +1,145 @@
+"""Tests for batch document processing in the LangGraph workflow."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.langgraph.workflow import (
+    _prepare_states,
+    process_document_async,
+    process_documents,
+    process_documents_async,
+)
+
+FOIA_REQUEST = "All records about the Blue Sky project."
+
+# Distinct words so a one-word edit leaves most shingles intact
+REPORT_TEXT = " ".join(f"finding{i}" for i in range(300))
+
+
+@pytest.fixture(autouse=True)
+def no_api_key(monkeypatch):
+    """Run without an API key so nothing calls OpenAI."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """Create an original, an exact copy, a near copy, and a missing file."""
+    (tmp_path / "report.txt").write_text(REPORT_TEXT)
+    (tmp_path / "report_copy.txt").write_text(REPORT_TEXT)
+    (tmp_path / "report_edit.txt").write_text(REPORT_TEXT.replace("finding250", "edited"))
+    (tmp_path / "memo.txt").write_text("Memo about the Blue Sky project budget review.")
+    return {
+        name: str(tmp_path / f"{name}.txt")
+        for name in ("report", "report_copy", "report_edit", "memo", "missing")
+    }
+
+
+class TestPrepareStates:
+    """Test suite for duplicate detection before the graph runs."""
+
+    def test_exact_copy_without_embedding_service(self, documents):
+        """Test that content-hash duplicates are found without an API key."""
+        states = _prepare_states(
+            [documents["report"], documents["report_copy"]], FOIA_REQUEST
+        )
+
+        assert not states[0].get("is_duplicate")
+        assert states[1]["is_duplicate"]
+        assert states[1]["duplicate_of"] == "report.txt"
+        assert states[1]["similarity_score"] == 1.0
+
+    def test_minhash_near_duplicate_without_embedding_service(self, documents):
+        """Test that lexical near duplicates are found without an API key."""
+        states = _prepare_states(
+            [documents["report"], documents["report_edit"]], FOIA_REQUEST
+        )
+
+        assert states[1]["is_duplicate"]
+        assert states[1]["duplicate_of"] == "report.txt"
+        assert 0.9 <= states[1]["similarity_score"] < 0.99
+
+    def test_only_remaining_documents_are_embedded(self, documents):
+        """Test that exact and MinHash duplicates are not sent for embedding."""
+        with (
+            patch("src.langgraph.workflow.EmbeddingService"),
+            patch("src.langgraph.workflow.CachedEmbeddingClient") as client_class,
+        ):
+            client = client_class.return_value
+            client.get_or_compute.side_effect = lambda texts, hashes: [
+                [float(i), 1.0] for i in range(len(texts))
+            ]
+            states = _prepare_states(
+                [documents[name] for name in ("report", "report_copy", "report_edit", "memo")],
+                FOIA_REQUEST,
+            )
+
+        texts, _ = client.get_or_compute.call_args.args
+        assert len(texts) == 2
+        assert states[0]["embedding_generated"] and states[3]["embedding_generated"]
+        assert not states[3]["is_duplicate"]
+
+    def test_unreadable_file_is_left_to_load_document(self, documents):
+        """Test that a read failure leaves empty content and no duplicate flags."""
+        states = _prepare_states([documents["missing"]], FOIA_REQUEST)
+
+        assert states[0]["content"] == ""
+        assert "is_duplicate" not in states[0]
+
+
+class TestProcessDocuments:
+    """Test suite for process_documents."""
+
+    def test_results_follow_input_order(self, documents):
+        """Test that results come back in filename order with duplicates skipped."""
+        names = ["memo", "missing", "report", "report_copy", "report_edit"]
+
+        results = process_documents([documents[name] for name in names], FOIA_REQUEST)
+
+        assert [Path(result["filename"]).stem for result in results] == names
+        assert "error" in results[1]
+        assert results[3]["classification"] == "duplicate"
+        assert results[4]["classification"] == "duplicate"
+
+
+class TestProcessDocumentsAsync:
+    """Test suite for the async workflow entry points."""
+
+    def test_single_document(self, documents):
+        """Test that one document runs through the graph asynchronously."""
+        result = asyncio.run(process_document_async(documents["memo"], FOIA_REQUEST))
+
+        assert result["filename"] == documents["memo"]
+        assert "OPENAI_API_KEY" in result["error"]
+
+    def test_concurrency_is_bounded_and_order_kept(self, tmp_path):
+        """Test that at most `concurrency` documents run and results keep input order."""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"doc{i}.txt"
+            path.write_text(f"Distinct document number {i} about budgets.")
+            paths.append(str(path))
+        in_flight = 0
+        peak = 0
+
+        async def ainvoke(state):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Earlier documents take longer, so completion order is reversed
+            await asyncio.sleep(0.01 * (6 - paths.index(state["filename"])))
+            in_flight -= 1
+            return {**state, "classification": "responsive"}
+
+        app = Mock()
+        app.ainvoke = ainvoke
+        with patch("src.langgraph.workflow.get_compiled_workflow", return_value=app):
+            results = asyncio.run(
+                process_documents_async(paths, FOIA_REQUEST, concurrency=2)
+            )
+
+        assert peak == 2
+        assert [result["filename"] for result in results] == paths